@@ -0,0 +1,47 @@
+"""
+Import time of application modules in a fresh interpreter, and whether importing them
+loads the database driver.
+
+    python -m benchmarks.cold_start --runs 20
+"""
+import statistics
+import subprocess
+import sys
+
+from . import utils
+
+MODULES = ("chronal_api.users.models", "chronal_api.main")
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "aiosqlite" in sys.modules)
+"""
+
+
+def measure(module: str, runs: int) -> tuple[float, bool]:
+    seconds = []
+    driver_loaded = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(module=module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        seconds.append(float(output[0]))
+        driver_loaded = output[1] == "True"
+    return statistics.median(seconds), driver_loaded
+
+
+def run(runs: int) -> None:
+    print(f"median of {runs} runs")
+    for module in MODULES:
+        seconds, driver_loaded = measure(module, runs)
+        print(f"{module:<32} {seconds * 1000:>10.1f} ms   driver loaded: {driver_loaded}")
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, runs=20).parse_args()
+    run(args.runs)
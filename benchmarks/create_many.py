@@ -0,0 +1,56 @@
+"""
+Bulk `create_many` (chunked insertmanyvalues) vs `session.add_all`.
+
+    python -m benchmarks.create_many --rows 50000
+"""
+import asyncio
+import tracemalloc
+from contextlib import nullcontext
+from typing import Iterator
+
+from chronal_api.users.models import User
+from chronal_api.users.repository import UserRepository
+
+from . import utils
+
+
+def users(name: str, rows: int) -> Iterator[User]:
+    for i in range(rows):
+        yield User(email=f"{name}-{i}@example.com", hashed_password="-")
+
+
+async def run(rows: int, chunk_size: int) -> None:
+    async with utils.database() as engine:
+        counter = utils.StatementCounter(engine)
+        sessionmaker = utils.sessionmaker(engine)
+
+        results = []
+        for name in ("add_all", f"bulk (chunk_size={chunk_size})"):
+            result = utils.Result(name)
+            # second pass only measures memory, tracemalloc skews the timings
+            for trace in (False, True):
+                async with sessionmaker() as session:
+                    repository = UserRepository(session)
+                    if trace:
+                        tracemalloc.start()
+                    with utils.measure(result, counter) if not trace else nullcontext():
+                        if name == "add_all":
+                            await repository.create_many(list(users(f"{name}-{trace}", rows)))
+                        else:
+                            await repository.create_many(
+                                users(f"{name}-{trace}", rows), bulk=True, chunk_size=chunk_size
+                            )
+                        await session.commit()
+                    if trace:
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+            results.append((result, peak))
+
+    print(f"create_many, {rows} users")
+    for result, peak in results:
+        print(f"{result} {peak / 2**20:>10.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, rows=50000, chunk_size=1000).parse_args()
+    asyncio.run(run(args.rows, args.chunk_size))
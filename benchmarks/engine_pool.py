@@ -0,0 +1,83 @@
+"""
+Request throughput of the engine built by `create_engine` from `DatabaseSettings` vs the
+previous hard-coded `create_async_engine(url, echo=True)`.
+
+    python -m benchmarks.engine_pool --requests 5000 --concurrency 20
+"""
+import asyncio
+import contextlib
+import os
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from chronal_api.lib.auth.models import AccessToken
+from chronal_api.lib.database.engine import create_engine
+from chronal_api.settings import DatabaseSettings
+from chronal_api.users.models import User
+
+from . import utils
+
+
+async def serve(
+    engine: AsyncEngine, tokens: list[bytes], requests: int, concurrency: int
+) -> float:
+    """Requests per second, each one a `db_session` transaction with a token lookup"""
+    sessionmaker = utils.sessionmaker(engine)
+    statement = select(User.id, User.email, AccessToken.expiration_date).join(
+        User, User.id == AccessToken.user_id
+    )
+    pending = iter(range(requests))
+
+    async def client() -> None:
+        for i in pending:
+            async with sessionmaker() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        statement.where(AccessToken.token_hash == tokens[i % len(tokens)])
+                    )
+                    result.one()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrency: int) -> None:
+    async with utils.database() as engine:
+        async with utils.sessionmaker(engine)() as session:
+            user = User(email="bench@example.com", hashed_password="-")
+            access_tokens = [AccessToken(user=user) for _ in range(100)]
+            session.add_all(access_tokens)
+            await session.commit()
+            tokens = [access_token.token_hash for access_token in access_tokens]
+
+        settings = DatabaseSettings(HOST=f"/{engine.url.database}")
+        engines: dict[str, Callable[[], AsyncEngine]] = {
+            "create_engine (queue pool)": lambda: create_engine(settings),
+            "create_engine, POOL_CLASS=null": lambda: create_engine(
+                settings.model_copy(update={"POOL_CLASS": "null"})
+            ),
+            # last, echo turns on INFO logging for every engine in the process
+            "old: echo=True (NullPool)": lambda: create_async_engine(
+                settings.get_url().render_as_string(), echo=True
+            ),
+        }
+
+        print(f"{requests} requests, {concurrency} at once")
+        results: dict[str, float] = {}
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for name, factory in engines.items():
+                bench_engine = factory()
+                results[name] = await serve(bench_engine, tokens, requests, concurrency)
+                await bench_engine.dispose()
+
+        for name, per_second in results.items():
+            print(f"{name:<32} {per_second:>10.1f} requests/s")
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, requests=5000, concurrency=20).parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
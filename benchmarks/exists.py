@@ -0,0 +1,58 @@
+"""
+`exists` with `SELECT EXISTS (SELECT 1 ... LIMIT 1)` vs the previous `COUNT(*) > 0`.
+
+    python -m benchmarks.exists --rows 100000 --repeat 200
+"""
+import asyncio
+from typing import Any
+
+from chronal_api.calendars.repository import CalendarRepository
+from chronal_api.users.models import User
+
+from . import utils
+
+
+async def count_exists(repository: CalendarRepository, **kwargs: Any) -> bool:
+    return await repository.count(**kwargs) > 0
+
+
+async def run(url: str | None, rows: int, repeat: int) -> None:
+    async with utils.database(url) as engine:
+        counter = utils.StatementCounter(engine)
+        sessionmaker = utils.sessionmaker(engine)
+
+        async with sessionmaker() as session:
+            owner = User(email="bench@example.com", hashed_password="-")
+            session.add(owner)
+            await session.flush()
+            repository = CalendarRepository(session)
+            ids = await repository.create_many(
+                ({"title": f"Calendar {i}", "owner_id": owner.id} for i in range(rows)),
+                bulk=True,
+            )
+            await session.commit()
+
+        checks: dict[str, dict[str, Any]] = {
+            "owner has calendars": {"owner_id": owner.id},
+            "title exists for owner (hit)": {"owner_id": owner.id, "title": "Calendar 10"},
+            "calendar owner (by id)": {"owner_id": owner.id, "id": ids[-1]},
+        }
+
+        print(f"exists, owner with {rows} calendars, {repeat} calls each")
+        async with sessionmaker() as session:
+            repository = CalendarRepository(session)
+            for check, kwargs in checks.items():
+                for name, exists in (
+                    ("COUNT(*) > 0", count_exists),
+                    ("EXISTS", CalendarRepository.exists),
+                ):
+                    result = utils.Result(f"{check}: {name}")
+                    with utils.measure(result, counter):
+                        for _ in range(repeat):
+                            assert await exists(repository, **kwargs)
+                    print(result)
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, url=None, rows=100000, repeat=200).parse_args()
+    asyncio.run(run(args.url, args.rows, args.repeat))
@@ -0,0 +1,81 @@
+"""
+Latency of an unrelated endpoint (`/healthcheck`) while a storm of password
+verifications runs, with argon2 called inline vs through the hashing executor.
+
+    python -m benchmarks.login_storm --logins 100 --concurrency 16
+"""
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from chronal_api.lib.auth import hashing, security
+from chronal_api.main import app
+
+Verify = Callable[[str, str], Awaitable[bool]]
+
+
+async def inline(plain_password: str, hashed_password: str) -> bool:
+    return security.verify_password(plain_password, hashed_password)
+
+
+async def probe(
+    client: httpx.AsyncClient, until: "asyncio.Task[None] | None" = None
+) -> list[float]:
+    latencies: list[float] = []
+    while len(latencies) < 100 if until is None else not until.done():
+        # the request is due after 1 ms, time spent waiting for the event loop counts
+        start = time.perf_counter() + 0.001
+        await asyncio.sleep(0.001)
+        response = await client.get("/healthcheck")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return latencies
+
+
+async def storm(verify: Verify, hashed_password: str, logins: int, concurrency: int) -> None:
+    remaining = iter(range(logins))
+
+    async def worker() -> None:
+        for _ in remaining:
+            assert await verify("passw0rd", hashed_password)
+            # a real login request yields to the event loop on I/O between hashes
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def report(name: str, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"{name:<24} p50 {quantiles[49] * 1000:>8.2f} ms   p99 {quantiles[98] * 1000:>8.2f} ms"
+        f"   max {max(latencies) * 1000:>8.2f} ms"
+    )
+
+
+async def run(logins: int, concurrency: int) -> None:
+    hashed_password = security.get_password_hash("passw0rd")
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+
+    print(f"/healthcheck during {logins} logins, {concurrency} at once")
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        report("idle", await probe(client))
+
+        for name, verify in (("inline argon2", inline), ("executor", hashing.verify_password)):
+            start = time.perf_counter()
+            login_storm = asyncio.create_task(storm(verify, hashed_password, logins, concurrency))
+            latencies = await probe(client, until=login_storm)
+            await login_storm
+            report(name, latencies)
+            print(f"{'':<24} {logins} logins in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    hashing.password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    from . import utils
+
+    args = utils.parser(__doc__, logins=100, concurrency=16).parse_args()
+    asyncio.run(run(args.logins, args.concurrency))
@@ -0,0 +1,86 @@
+"""
+Read/write mix on SQLite with the connect-time pragmas of `DatabaseSettings` vs SQLite's
+defaults (rollback journal, `synchronous=FULL`).
+
+    python -m benchmarks.sqlite_pragmas --operations 5000 --concurrency 16 --writes 20
+"""
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from chronal_api.calendars.models import Calendar
+from chronal_api.lib.database.engine import create_engine
+from chronal_api.settings import DatabaseSettings
+from chronal_api.users.models import User
+
+from . import utils
+
+DEFAULTS = {
+    "SQLITE_JOURNAL_MODE": None,
+    "SQLITE_SYNCHRONOUS": None,
+    "SQLITE_MMAP_SIZE": None,
+    "SQLITE_CACHE_SIZE": None,
+    "SQLITE_TEMP_STORE": None,
+    "SQLITE_BUSY_TIMEOUT": None,
+}
+
+
+async def run_profile(
+    name: str, settings: dict[str, None], operations: int, concurrency: int, writes: int
+) -> None:
+    async with utils.database() as seed_engine:
+        async with utils.sessionmaker(seed_engine)() as session:
+            owner = User(email="bench@example.com", hashed_password="-")
+            session.add(owner)
+            session.add_all(Calendar(title=f"Calendar {i}", owner=owner) for i in range(1000))
+            await session.commit()
+            owner_id = owner.id
+
+        engine = create_engine(
+            DatabaseSettings(
+                HOST=f"/{seed_engine.url.database}", POOL_SIZE=concurrency, **settings
+            )
+        )
+        sessionmaker = utils.sessionmaker(engine)
+        pending = iter(range(operations))
+        reads = errors = 0
+
+        async def client() -> None:
+            nonlocal reads, errors
+            for i in pending:
+                try:
+                    async with sessionmaker() as session:
+                        async with session.begin():
+                            if random.randrange(100) < writes:
+                                session.add(Calendar(title=f"New {i}", owner_id=owner_id))
+                            else:
+                                await session.scalar(
+                                    select(func.count()).where(Calendar.owner_id == owner_id)
+                                )
+                                reads += 1
+                except OperationalError:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+        await engine.dispose()
+
+    print(
+        f"{name:<24} {operations / seconds:>10.1f} ops/s "
+        f"{reads / seconds:>10.1f} reads/s {errors:>6} errors"
+    )
+
+
+async def run(operations: int, concurrency: int, writes: int) -> None:
+    print(f"{operations} operations, {writes}% writes, {concurrency} at once")
+    await run_profile("SQLite defaults", DEFAULTS, operations, concurrency, writes)
+    await run_profile("DatabaseSettings pragmas", {}, operations, concurrency, writes)
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, operations=5000, concurrency=16, writes=20).parse_args()
+    asyncio.run(run(args.operations, args.concurrency, args.writes))
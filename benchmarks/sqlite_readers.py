@@ -0,0 +1,102 @@
+"""
+SQLite with `DB_SQLITE_READERS` read-only connections and a single queued writer vs one
+shared pool. Writes read before they insert, like `CalendarService.create_calendar`.
+
+    python -m benchmarks.sqlite_readers --operations 5000 --concurrency 16 --writes 20 \
+        --busy-timeout 5000
+"""
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from chronal_api.calendars.models import Calendar
+from chronal_api.lib.database.engine import create_engine
+from chronal_api.settings import DatabaseSettings
+from chronal_api.users.models import User
+
+from . import utils
+
+
+async def run_profile(
+    name: str,
+    readers: int | None,
+    operations: int,
+    concurrency: int,
+    writes: int,
+    busy_timeout: int,
+) -> None:
+    async with utils.database() as seed_engine:
+        async with utils.sessionmaker(seed_engine)() as session:
+            owner = User(email="bench@example.com", hashed_password="-")
+            session.add(owner)
+            session.add_all(Calendar(title=f"Calendar {i}", owner=owner) for i in range(1000))
+            await session.commit()
+            owner_id = owner.id
+
+        settings = DatabaseSettings(
+            HOST=f"/{seed_engine.url.database}",
+            POOL_SIZE=concurrency,
+            SQLITE_READERS=readers,
+            SQLITE_BUSY_TIMEOUT=busy_timeout,
+        )
+        write_engine = create_engine(settings)
+        read_engine = create_engine(settings, read_only=True) if readers else write_engine
+        write_sessionmaker = utils.sessionmaker(write_engine)
+        read_sessionmaker = utils.sessionmaker(read_engine)
+        pending = iter(range(operations))
+        reads = errors = 0
+
+        async def client() -> None:
+            nonlocal reads, errors
+            for i in pending:
+                write = random.randrange(100) < writes
+                sessionmaker = write_sessionmaker if write else read_sessionmaker
+                try:
+                    async with sessionmaker() as session:
+                        async with session.begin():
+                            await session.scalar(
+                                select(func.count()).where(Calendar.owner_id == owner_id)
+                            )
+                            if write:
+                                session.add(Calendar(title=f"New {i}", owner_id=owner_id))
+                            else:
+                                reads += 1
+                except OperationalError:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+        await write_engine.dispose()
+        await read_engine.dispose()
+
+    print(
+        f"{name:<24} {operations / seconds:>10.1f} ops/s "
+        f"{reads / seconds:>10.1f} reads/s {errors:>6} errors"
+    )
+
+
+async def run(
+    operations: int, concurrency: int, writes: int, readers: int, busy_timeout: int
+) -> None:
+    print(
+        f"{operations} operations, {writes}% writes, {concurrency} at once, "
+        f"busy_timeout={busy_timeout} ms"
+    )
+    for name, profile_readers in (
+        ("shared pool", None),
+        (f"{readers} readers, 1 writer", readers),
+    ):
+        await run_profile(name, profile_readers, operations, concurrency, writes, busy_timeout)
+
+
+if __name__ == "__main__":
+    args = utils.parser(
+        __doc__, operations=5000, concurrency=16, writes=20, readers=4, busy_timeout=5000
+    ).parse_args()
+    asyncio.run(
+        run(args.operations, args.concurrency, args.writes, args.readers, args.busy_timeout)
+    )
@@ -0,0 +1,103 @@
+"""
+`access_tokens` keyed by the raw bearer token (`String(1024)`) vs by its 32 byte
+SHA-256 digest: primary key lookup latency and database size.
+
+    python -m benchmarks.token_keys --rows 1000000 --lookups 20000
+"""
+import os
+import random
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable
+
+import pysqlite3
+from sqlalchemy import (
+    Column,
+    DateTime,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    text,
+)
+
+from chronal_api.lib.auth import security
+
+from . import utils
+
+metadata = MetaData()
+VARIANTS: dict[str, tuple[Table, Callable[[str], Any]]] = {
+    "String(1024)": (
+        Table(
+            "access_tokens",
+            metadata,
+            Column("access_token", String(1024), primary_key=True),
+            Column("user_id", String(36), nullable=False),
+            Column("expiration_date", DateTime, nullable=False),
+        ),
+        lambda token: token,
+    ),
+    "SHA-256 LargeBinary(32)": (
+        Table(
+            "access_tokens_hashed",
+            metadata,
+            Column("token_hash", LargeBinary(32), primary_key=True),
+            Column("user_id", String(36), nullable=False),
+            Column("expiration_date", DateTime, nullable=False),
+        ),
+        security.hash_token,
+    ),
+}
+
+
+def run(rows: int, lookups: int, chunk_size: int = 50000) -> None:
+    tokens = [security.generate_token() for _ in range(rows)]
+    sample = random.sample(tokens, min(lookups, rows))
+    user_id = "0b4d3f4e-2f4e-4c7b-9a38-4c9b6f0d1a11"
+    expiration_date = security.generate_token_expiration_date().replace(tzinfo=None)
+
+    print(f"{rows} tokens, {len(sample)} primary key lookups")
+    for name, (table, key) in VARIANTS.items():
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.db"
+            engine = create_engine(f"sqlite:///{path}", module=pysqlite3)
+            with engine.begin() as conn:
+                table.create(conn)
+                for start in range(0, rows, chunk_size):
+                    conn.execute(
+                        table.insert(),
+                        [
+                            {
+                                table.primary_key.columns[0].name: key(token),
+                                "user_id": user_id,
+                                "expiration_date": expiration_date,
+                            }
+                            for token in tokens[start : start + chunk_size]
+                        ],
+                    )
+            with engine.connect() as conn:
+                conn.execute(text("VACUUM"))
+
+            # raw DBAPI lookups, so only the key comparison and the hashing differ
+            key_name = table.primary_key.columns[0].name
+            query = f"SELECT user_id, expiration_date FROM {table.name} WHERE {key_name} = ?"
+            with engine.connect() as conn:
+                cursor = conn.connection.cursor()
+                start = time.perf_counter()
+                for token in sample:
+                    assert cursor.execute(query, (key(token),)).fetchone()
+                seconds = time.perf_counter() - start
+
+            engine.dispose()
+            size = os.path.getsize(path)
+            print(
+                f"{name:<24} {seconds / len(sample) * 1e6:>8.1f} us/lookup "
+                f"{size / 2**20:>10.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, rows=1000000, lookups=20000).parse_args()
+    run(args.rows, args.lookups)
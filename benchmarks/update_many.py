@@ -0,0 +1,67 @@
+"""
+Bulk `update_many` vs the previous per-row merge/flush/refresh loop.
+
+    python -m benchmarks.update_many --rows 5000
+"""
+import asyncio
+
+from chronal_api.calendars.models import Calendar
+from chronal_api.calendars.repository import CalendarRepository
+from chronal_api.users.models import User
+
+from . import utils
+
+
+async def per_row_update_many(
+    repository: CalendarRepository, data: list[Calendar]
+) -> list[Calendar]:
+    instances: list[Calendar] = []
+    for d in data:
+        instance = await repository._attach_to_session(d, strategy="merge")
+        await repository._flush_or_commit()
+        await repository._refresh(instance, auto_refresh=True)
+        instances.append(instance)
+    return instances
+
+
+async def run(rows: int, chunk_size: int) -> None:
+    async with utils.database() as engine:
+        counter = utils.StatementCounter(engine)
+        sessionmaker = utils.sessionmaker(engine)
+
+        async with sessionmaker() as session:
+            owner = User(email="bench@example.com", hashed_password="-")
+            session.add(owner)
+            await session.flush()
+            session.add_all(
+                [Calendar(title=f"Calendar {i}", owner_id=owner.id) for i in range(rows)]
+            )
+            await session.commit()
+
+        results = []
+        for name in ("per-row loop", f"bulk (chunk_size={chunk_size})"):
+            async with sessionmaker() as session:
+                calendars = await CalendarRepository(session).list_()
+            # detached, as if patched from request payloads
+            for calendar in calendars:
+                calendar.title = f"{calendar.title} ({name})"
+
+            async with sessionmaker() as session:
+                repository = CalendarRepository(session)
+                result = utils.Result(name)
+                with utils.measure(result, counter):
+                    if name == "per-row loop":
+                        await per_row_update_many(repository, calendars)
+                    else:
+                        await repository.update_many(calendars, chunk_size=chunk_size)
+                    await session.commit()
+                results.append(result)
+
+    print(f"update_many, {rows} rows")
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, rows=5000, chunk_size=1000).parse_args()
+    asyncio.run(run(args.rows, args.chunk_size))
@@ -0,0 +1,70 @@
+"""
+`INSERT ... ON CONFLICT DO UPDATE` upsert_many vs the previous per-row merge loop.
+
+    python -m benchmarks.upsert_many --rows 10000
+"""
+import asyncio
+import uuid
+
+from chronal_api.calendars.models import Calendar
+from chronal_api.calendars.repository import CalendarRepository
+from chronal_api.users.models import User
+
+from . import utils
+
+
+async def merge_upsert_many(
+    repository: CalendarRepository, data: list[Calendar]
+) -> list[Calendar]:
+    instances: list[Calendar] = []
+    for d in data:
+        instance = await repository._attach_to_session(d, strategy="merge")
+        await repository._flush_or_commit()
+        await repository._refresh(instance, auto_refresh=True)
+        instances.append(instance)
+    return instances
+
+
+async def run(rows: int, chunk_size: int) -> None:
+    async with utils.database() as engine:
+        counter = utils.StatementCounter(engine)
+        sessionmaker = utils.sessionmaker(engine)
+
+        async with sessionmaker() as session:
+            owner = User(email="bench@example.com", hashed_password="-")
+            session.add(owner)
+            await session.flush()
+            owner_id = owner.id
+            # every strategy updates the same existing half and inserts a new half
+            existing = [uuid.uuid4() for _ in range(rows // 2)]
+            session.add_all(
+                [Calendar(id=id, title="existing", owner_id=owner_id) for id in existing]
+            )
+            await session.commit()
+
+        results = []
+        for name in ("merge loop", f"on conflict (chunk_size={chunk_size})"):
+            data = [Calendar(id=id, title=name, owner_id=owner_id) for id in existing] + [
+                Calendar(id=uuid.uuid4(), title=name, owner_id=owner_id)
+                for _ in range(rows - len(existing))
+            ]
+
+            async with sessionmaker() as session:
+                repository = CalendarRepository(session)
+                result = utils.Result(name)
+                with utils.measure(result, counter):
+                    if name == "merge loop":
+                        await merge_upsert_many(repository, data)
+                    else:
+                        await repository.upsert_many(data, chunk_size=chunk_size)
+                    await session.commit()
+                results.append(result)
+
+    print(f"upsert_many, {rows} rows ({rows // 2} existing)")
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    args = utils.parser(__doc__, rows=10000, chunk_size=1000).parse_args()
+    asyncio.run(run(args.rows, args.chunk_size))
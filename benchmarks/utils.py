@@ -0,0 +1,90 @@
+import argparse
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, AsyncIterator, Iterator
+
+import pysqlite3
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from chronal_api.calendars.models import Calendar  # noqa: F401
+from chronal_api.lib.auth.models import AccessToken  # noqa: F401
+from chronal_api.lib.database.engine import Base
+from chronal_api.users.models import User  # noqa: F401
+
+
+class StatementCounter:
+    """Counts DBAPI round trips (`execute`/`executemany` calls) on an engine"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def reset(self) -> None:
+        self.count = 0
+
+
+class Result:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.seconds = 0.0
+        self.statements = 0
+
+    def __str__(self) -> str:
+        return f"{self.name:<32} {self.seconds * 1000:>10.1f} ms {self.statements:>10} statements"
+
+
+def parser(description: str, **defaults: int | str | None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    for name, default in defaults.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=type(default) if default is not None else str,
+            default=default,
+        )
+    return parser
+
+
+@asynccontextmanager
+async def database(url: str | None = None, **kwargs: Any) -> AsyncIterator[AsyncEngine]:
+    """Throwaway SQLite database, or the schema created in and dropped from `url`"""
+    with TemporaryDirectory() as tmp:
+        if url is None:
+            url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+            kwargs.setdefault("module", pysqlite3)
+        engine = create_async_engine(url, **kwargs)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            yield engine
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+
+
+def sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@contextmanager
+def measure(result: Result, counter: StatementCounter) -> Iterator[None]:
+    counter.reset()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result.seconds = time.perf_counter() - start
+        result.statements = counter.count
@@ -4,7 +4,9 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 
 from chronal_api.calendars import models as calendars_models
+from chronal_api.lib.auth import dependencies as auth_dependencies
 from chronal_api.lib.database import dependencies as db_dependencies
+from chronal_api.lib.service import exceptions as service_exceptions
 
 from . import exceptions, repository, service
 
@@ -13,23 +15,29 @@ async def calendar_service(session: db_dependencies.DbSession) -> service.Calend
     return service.CalendarService(repository.CalendarRepository(session))
 
 
-async def _get_calendar_or_404(
+async def _get_user_calendar(
     id: UUID,
+    user: auth_dependencies.CurrentUser,
     service: service.CalendarService = Depends(calendar_service),
 ) -> calendars_models.Calendar:
-    calendar = await service.get_one_or_none(id)
-    if calendar is None:
+    try:
+        return await service.get_user_calendar(user.id, id)
+    except service_exceptions.ItemNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"msg": exceptions.HTTPError.CALENDAR_NOT_FOUND},
         )
-    return calendar
+    except exceptions.NotCalendarOwner:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"msg": exceptions.HTTPError.FORBIDDEN},
+        )
 
 
 # Annotated
 
 CalendarService = Annotated[service.CalendarService, Depends(calendar_service)]
-get_calendar_or_404 = Annotated[calendars_models.Calendar, Depends(_get_calendar_or_404)]
+UserCalendar = Annotated[calendars_models.Calendar, Depends(_get_user_calendar)]
 
 
-__all__ = ["CalendarService", "get_calendar_or_404"]
+__all__ = ["CalendarService", "UserCalendar"]
@@ -7,7 +7,12 @@ class TitleNotUnique(service_exceptions.ServiceException):
     ...
 
 
+class NotCalendarOwner(service_exceptions.ServiceException):
+    ...
+
+
 class HTTPError(StrEnum):
     TITLE_NOT_UNIQUE = "Calendar with this title already exists"
     CALENDAR_NOT_FOUND = "Calendar not found"
     FORBIDDEN = "You don't have access to this calendar"
+    INVALID_CURSOR = "Invalid cursor"
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from chronal_api.lib.database import mixins
@@ -13,9 +13,13 @@ if TYPE_CHECKING:
 
 class Calendar(Base, mixins.UUIDPrimaryKeyMixin, mixins.TimestampMixin):
     __tablename__ = "calendars"
+    # keyset pagination of user calendars by (created_at, id)
+    __table_args__ = (
+        Index("calendars_owner_id_created_at_id_idx", "owner_id", "created_at", "id"),
+    )
 
     title: Mapped[str] = mapped_column(String(length=255))
     description: Mapped[Optional[str]] = mapped_column(Text)
-    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users_.id", ondelete="CASCADE"), index=True)
+    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users_.id", ondelete="CASCADE"))
 
     owner: Mapped["User"] = relationship("User", lazy="raise_on_sql")
@@ -1,10 +1,9 @@
-from uuid import UUID
-
-from fastapi import Depends, HTTPException, Response, status
+from fastapi import Depends, HTTPException, Query, Response, status
 
 from chronal_api.lib import router as lib_router
 from chronal_api.lib import schemas as api_schemas
 from chronal_api.lib.auth import dependencies as auth_dependencies
+from chronal_api.lib.service import exceptions as service_exceptions
 
 from . import dependencies, exceptions, schemas
 
@@ -14,8 +13,15 @@ router = lib_router.APIRouter(
     api_routes_responses={
         "calendars:list": {
             status.HTTP_200_OK: {
-                "description": "List of user calendars",
-                "model": list[schemas.CalendarRead],
+                "description": "Page of user calendars",
+                "model": api_schemas.Page[schemas.CalendarRead],
+            },
+            status.HTTP_400_BAD_REQUEST: {
+                "description": "Invalid cursor",
+                "model": api_schemas.Message,
+                "content": {
+                    "application/json": {"example": {"msg": exceptions.HTTPError.INVALID_CURSOR}}
+                },
             },
             status.HTTP_401_UNAUTHORIZED: {
                 "description": "Unauthorized",
@@ -130,29 +136,28 @@ router = lib_router.APIRouter(
 )
 
 
-@router.get("", name="calendars:list", response_model=list[schemas.CalendarRead])
+@router.get("", name="calendars:list", response_model=api_schemas.Page[schemas.CalendarRead])
 async def list_users_calendars(
-    user: auth_dependencies.CurrentUser, calendar_service: dependencies.CalendarService
-):
-    calendars = await calendar_service.list_(owner_id=user.id)
-    return calendars
-
-
-@router.get("/{id}", name="calendars:get_by_id", response_model=schemas.CalendarRead)
-async def get_calendar_by_id(
-    id: UUID,
     user: auth_dependencies.CurrentUser,
     calendar_service: dependencies.CalendarService,
-    calendar: dependencies.get_calendar_or_404,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = None,
 ):
-    if not await calendar_service.is_calendar_owner(user.id, id):
+    try:
+        calendars, next_cursor = await calendar_service.paginate(
+            limit, cursor, owner_id=user.id, projection=schemas.CalendarRead
+        )
+    except service_exceptions.InvalidCursor:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={
-                "msg": exceptions.HTTPError.FORBIDDEN,
-            },
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"msg": exceptions.HTTPError.INVALID_CURSOR},
         )
+    else:
+        return {"items": calendars, "next_cursor": next_cursor}
 
+
+@router.get("/{id}", name="calendars:get_by_id", response_model=schemas.CalendarRead)
+async def get_calendar_by_id(calendar: dependencies.UserCalendar):
     return calendar
 
 
@@ -180,20 +185,10 @@ async def create_calendar(
 
 @router.patch("/{id}", name="calendars:update", response_model=schemas.CalendarRead)
 async def update_calendar(
-    id: UUID,
     data: schemas.CalendarPatch,
-    user: auth_dependencies.CurrentUser,
     calendar_service: dependencies.CalendarService,
-    calendar: dependencies.get_calendar_or_404,
+    calendar: dependencies.UserCalendar,
 ):
-    if not await calendar_service.is_calendar_owner(user.id, calendar.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={
-                "msg": exceptions.HTTPError.FORBIDDEN,
-            },
-        )
-
     try:
         calendar = await calendar_service.update_calendar(calendar, data)
     except exceptions.TitleNotUnique:
@@ -210,19 +205,9 @@ async def update_calendar(
     name="calendars:delete",
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
-    dependencies=[Depends(dependencies._get_calendar_or_404)],
 )
 async def delete_calendar(
-    id: UUID,
-    user: auth_dependencies.CurrentUser,
     calendar_service: dependencies.CalendarService,
+    calendar: dependencies.UserCalendar,
 ):
-    if not await calendar_service.is_calendar_owner(user.id, id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={
-                "msg": exceptions.HTTPError.FORBIDDEN,
-            },
-        )
-
-    await calendar_service.delete_calendar(id)
+    await calendar_service.delete_calendar(calendar.id)
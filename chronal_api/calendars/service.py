@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from chronal_api.lib.service import Service
+from chronal_api.lib.service import exceptions as service_exceptions
 
 from . import exceptions, models, repository, schemas
 
@@ -13,6 +14,15 @@ class CalendarService(Service[models.Calendar, UUID]):
         is_owner = await self.repository.user_is_calendar_owner(user_id, calendar_id)
         return is_owner
 
+    async def get_user_calendar(self, user_id: UUID, calendar_id: UUID) -> models.Calendar:
+        """Loads the calendar and checks its owner with a single query"""
+        calendar = await self.get_one_or_none(calendar_id)
+        if calendar is None:
+            raise service_exceptions.ItemNotFound()
+        if calendar.owner_id != user_id:
+            raise exceptions.NotCalendarOwner()
+        return calendar
+
     async def create_calendar(
         self, data: schemas.CalendarCreate, user_id: UUID
     ) -> models.Calendar:
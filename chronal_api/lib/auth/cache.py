@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Generic, TypeVar
+
+from chronal_api.settings import get_app_settings
+
+from .principal import Principal
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+settings = get_app_settings()
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache. An entry is dropped `ttl` seconds after it was set or once its
+    `expires_at` has passed, whichever comes first. When full, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, datetime | None, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        deadline, expires_at, value = entry
+        if deadline <= time.monotonic() or (
+            expires_at is not None and expires_at <= datetime.now(tz=timezone.utc)
+        ):
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: datetime | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[V], bool]) -> int:
+        """Drops every entry whose value matches, scans the whole cache"""
+        keys = [key for key, (_, _, value) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+        )
+
+
+TokenCache = TTLCache[str, Principal]
+
+# principals of validated tokens of this process, `AuthService.delete_token` invalidates them
+token_cache: TokenCache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
@@ -10,6 +10,7 @@ from chronal_api.lib.database import dependencies as db_dependencies
 from chronal_api.users.models import User
 
 from . import exceptions, repository, service
+from .principal import Principal
 
 
 class HTTPBearer(HTTPBearer_):
@@ -32,42 +33,59 @@ async def auth_service(
     return service.AuthService(repository.AccessTokenRepository(session))
 
 
+async def write_auth_service(
+    session: db_dependencies.DbWriteSession,
+) -> service.AuthService:
+    """`AuthService` that creates tokens from a route running on a read session"""
+    return service.AuthService(repository.AccessTokenRepository(session))
+
+
 async def get_current_user(
     security: HTTPAuthorizationCredentials | None = Depends(authorization_bearer),
     auth_service: service.AuthService = Depends(auth_service),
-) -> User:
+) -> Principal:
     if security is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail={"msg": "Unauthorized"}
         )
 
     try:
-        access_token = await auth_service.validate_access_token(security.credentials)
+        return await auth_service.get_principal(security.credentials)
     except (exceptions.InvalidAccessToken, exceptions.ExpiredAccessToken) as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail={"msg": "Unauthorized"}
         ) from exc
-    else:
-        return access_token.user
 
 
 async def get_optional_current_user(
     security: HTTPAuthorizationCredentials | None = Depends(authorization_bearer),
     auth_service: service.AuthService = Depends(auth_service),
-) -> User | None:
+) -> Principal | None:
     if security is None:
         return None
 
     try:
-        access_token = await auth_service.validate_access_token(security.credentials)
+        return await auth_service.get_principal(security.credentials)
     except (exceptions.InvalidAccessToken, exceptions.ExpiredAccessToken):
         return None
-    else:
-        return access_token.user
+
+
+async def get_current_user_entity(
+    principal: Principal = Depends(get_current_user),
+    auth_service: service.AuthService = Depends(auth_service),
+) -> User:
+    try:
+        return await auth_service.get_principal_user(principal)
+    except exceptions.InvalidAccessToken as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail={"msg": "Unauthorized"}
+        ) from exc
 
 
 # Annotated
 
 AuthService = Annotated[service.AuthService, Depends(auth_service)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
-OptionalCurrentUser = Annotated[User | None, Depends(get_optional_current_user)]
+WriteAuthService = Annotated[service.AuthService, Depends(write_auth_service)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+CurrentUserEntity = Annotated[User, Depends(get_current_user_entity)]
+OptionalCurrentUser = Annotated[Principal | None, Depends(get_optional_current_user)]
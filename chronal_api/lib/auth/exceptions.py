@@ -13,3 +13,13 @@ class InvalidAccessToken(ServiceException):
 
 class ExpiredAccessToken(ServiceException):
     ...
+
+
+class PasswordHasherBusy(ServiceException):
+    ...
+
+
+class TooManyLoginAttempts(ServiceException):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
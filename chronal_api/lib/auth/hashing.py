@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from chronal_api.settings import PasswordHasherSettings
+
+from . import exceptions, security
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs argon2 hashing and verification in an executor so it does not block the event
+    loop. At most `max_pending` jobs are submitted at once, other callers wait for a free
+    slot up to `queue_timeout` seconds and then get `PasswordHasherBusy`.
+
+    argon2-cffi releases the GIL, so the default thread pool hashes in parallel.
+    """
+
+    def __init__(self, settings: PasswordHasherSettings) -> None:
+        self.settings = settings
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(settings.max_pending)
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.settings.executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.settings.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.settings.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.settings.queue_timeout)
+        except TimeoutError:
+            raise exceptions.PasswordHasherBusy() from None
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self._slots.release()
+
+    async def hash_password(self, password: str) -> str:
+        return await self.run(security.get_password_hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(security.verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+password_hasher = PasswordHasher(PasswordHasherSettings())
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash_password(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify_password(plain_password, hashed_password)
@@ -1,14 +1,14 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from chronal_api.lib.database import mixins, types
 from chronal_api.lib.database.engine import Base
 
-from .security import generate_token, generate_token_expiration_date
+from .security import generate_token, generate_token_expiration_date, hash_token
 
 if TYPE_CHECKING:
     from chronal_api.users.models import User
@@ -17,13 +17,22 @@ if TYPE_CHECKING:
 class AccessToken(Base, mixins.TimestampMixin):
     __tablename__ = "access_tokens"
 
-    access_token: Mapped[str] = mapped_column(
-        String(1024), primary_key=True, default=generate_token
-    )
+    # SHA-256 of the bearer token, the token itself is never stored
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), primary_key=True)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users_.id"), index=True)
     expiration_date: Mapped[datetime] = mapped_column(
         types.DateTimeUTC,
         default=generate_token_expiration_date,
+        index=True,
     )
+    # only set for signed tokens, which are revoked instead of deleted
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(types.DateTimeUTC, index=True)
 
     user: Mapped["User"] = relationship("User", lazy="joined")
+
+    # the bearer token, only known to the instance that created it
+    access_token = None
+
+    def __init__(self, access_token: str | None = None, **kwargs: Any) -> None:
+        self.access_token = access_token if access_token is not None else generate_token()
+        super().__init__(token_hash=hash_token(self.access_token), **kwargs)
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated user as seen by the routes, the full `User` is loaded on demand"""
+
+    id: UUID
+    email: str
+    expiration_date: datetime
@@ -1,17 +1,167 @@
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, bindparam, delete, select, update
 
 from chronal_api.lib.repository.sqlalchemy import SQLAlchemyRepository
+from chronal_api.lib.repository.utils import chunked, sql_error_handler
+from chronal_api.users.models import User
 
-from . import models
+from . import models, security
+from .principal import Principal
 
 if TYPE_CHECKING:
-    from chronal_api.users.models import User
+    from sqlalchemy.engine import CursorResult
+
+SelectT = TypeVar("SelectT", bound=Select[Any])
 
 
 class AccessTokenRepository(SQLAlchemyRepository[models.AccessToken, str]):
+    """Takes bearer tokens as ids and `access_token=` filters, looks them up by hash"""
+
     model = models.AccessToken
-    model_id_attr_name = "access_token"
+    model_id_attr_name = "token_hash"
+
+    async def _where_from_kwargs(self, statement: SelectT, **kwargs: Any) -> SelectT:
+        if "access_token" in kwargs:
+            kwargs["token_hash"] = security.hash_token(kwargs.pop("access_token"))
+        return await super()._where_from_kwargs(statement, **kwargs)
+
+    async def get(self, id: str, *args: Any, **kwargs: Any) -> models.AccessToken:
+        return await super().get(security.hash_token(id), *args, **kwargs)  # type: ignore
+
+    async def get_one(self, id: str, **kwargs: Any) -> models.AccessToken:
+        return await super().get_one(security.hash_token(id), **kwargs)  # type: ignore
+
+    async def get_one_or_none(self, id: str, **kwargs: Any) -> models.AccessToken | None:
+        return await super().get_one_or_none(security.hash_token(id), **kwargs)  # type: ignore
 
     async def create_token(self, user: "User") -> models.AccessToken:
-        token = await self.create(models.AccessToken(user=user))
+        token = await self.create(models.AccessToken(user_id=user.id))
         return token
+
+    async def create_signed_token(self, user: "User") -> models.AccessToken:
+        # the signed timestamp has a one second resolution
+        expiration_date = security.generate_token_expiration_date().replace(microsecond=0)
+        access_token = security.generate_signed_token(user.id, expiration_date)
+        return await self.create(
+            models.AccessToken(
+                access_token=access_token, user_id=user.id, expiration_date=expiration_date
+            )
+        )
+
+    async def get_principal(self, access_token: str) -> Principal | None:
+        """Joins the token with the few user columns the routes need, no ORM entities"""
+        statement = (
+            select(User.id, User.email, self.model.expiration_date)
+            .join(User, User.id == self.model.user_id)
+            .where(
+                self.model.token_hash == security.hash_token(access_token),
+                self.model.revoked_at.is_(None),
+            )
+        )
+        async with sql_error_handler():
+            row = (await self.session.execute(statement)).one_or_none()
+        return Principal(*row) if row is not None else None
+
+    async def get_user_email(self, user_id: UUID) -> str | None:
+        statement = select(User.email).where(User.id == user_id)
+        async with sql_error_handler():
+            return await self.session.scalar(statement)
+
+    async def get_user(self, user_id: UUID) -> User | None:
+        async with sql_error_handler():
+            return await self.session.get(User, user_id)
+
+    async def revoke_token(self, access_token: str, revoked_at: datetime) -> bool:
+        statement = (
+            update(self.model)
+            .where(
+                self.model.token_hash == security.hash_token(access_token),
+                self.model.revoked_at.is_(None),
+            )
+            .values(revoked_at=revoked_at)
+        )
+        async with sql_error_handler():
+            result: "CursorResult" = await self.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            )
+            return result.rowcount > 0
+
+    async def revoke_user_tokens(
+        self, user_id: UUID, revoked_at: datetime, created_before: datetime | None = None
+    ) -> list[tuple[bytes, datetime]]:
+        """Revokes the user's tokens, returns `(token_hash, expiration_date)` of each"""
+        statement = (
+            update(self.model)
+            .where(self.model.user_id == user_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+            .returning(self.model.token_hash, self.model.expiration_date)
+        )
+        if created_before is not None:
+            statement = statement.where(self.model.created_at < created_before)
+
+        async with sql_error_handler():
+            result = await self.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            )
+            return [tuple(row) for row in result]  # type: ignore
+
+    async def list_revoked(
+        self, since: datetime | None = None
+    ) -> list[tuple[bytes, datetime, datetime]]:
+        """
+        `(token_hash, expiration_date, revoked_at)` of unexpired tokens revoked at or
+        after `since`
+        """
+        statement = select(
+            self.model.token_hash, self.model.expiration_date, self.model.revoked_at
+        ).where(
+            self.model.revoked_at.is_not(None),
+            self.model.expiration_date > datetime.now(tz=timezone.utc),
+        )
+        if since is not None:
+            statement = statement.where(self.model.revoked_at >= since)
+
+        async with sql_error_handler():
+            return [tuple(row) for row in await self.session.execute(statement)]  # type: ignore
+
+    async def delete_expired(self, now: datetime, limit: int) -> int:
+        """Deletes at most `limit` tokens that expired before `now`"""
+        expired = (
+            select(self.model.token_hash)
+            .where(self.model.expiration_date <= now)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        statement = delete(self.model).where(self.model.token_hash.in_(expired))
+
+        async with sql_error_handler():
+            result: "CursorResult" = await self.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            )
+            return result.rowcount
+
+    async def extend_expiration(self, expiration_dates: dict[bytes, datetime]) -> None:
+        """
+        Sets new expiration dates by token hash with an executemany UPDATE per chunk.
+        Expiration dates are never moved back and deleted tokens are skipped.
+        """
+        table = self.model.__table__
+        statement = (
+            update(table)
+            .where(
+                table.c.token_hash == bindparam("b_token_hash"),
+                table.c.expiration_date < bindparam("b_expiration_date"),
+            )
+            .values(expiration_date=bindparam("b_expiration_date"))
+        )
+        params = [
+            {"b_token_hash": token_hash, "b_expiration_date": expiration_date}
+            for token_hash, expiration_date in expiration_dates.items()
+        ]
+
+        async with sql_error_handler():
+            for chunk in chunked(params, self.chunk_size):
+                await self.session.execute(statement, chunk)
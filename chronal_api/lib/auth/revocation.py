@@ -0,0 +1,73 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from chronal_api.settings import get_app_settings
+
+if TYPE_CHECKING:
+    from .repository import AccessTokenRepository
+
+settings = get_app_settings()
+
+
+class RevocationSet:
+    """
+    Hashes of revoked, not yet expired signed tokens. Revocations made by other processes
+    are picked up by `reload`, which reads rows revoked since the latest `revoked_at` it
+    has seen minus `reload_interval + margin`. `revoked_at` is set before its transaction
+    commits, by whichever clock that process has, so an earlier timestamp can show up
+    after a later one. Every `full_reload_interval` seconds all rows are read instead.
+    Expired hashes are dropped, so the set never outgrows `TOKEN_DURATION` worth of
+    logouts.
+    """
+
+    def __init__(
+        self, reload_interval: float, margin: float = 60.0, full_reload_interval: float = 600.0
+    ) -> None:
+        self.reload_interval = reload_interval
+        self.overlap = timedelta(seconds=reload_interval + margin)
+        self.full_reload_interval = full_reload_interval
+        self._revoked: dict[bytes, float] = {}  # token hash -> expiration timestamp
+        self._last_revoked_at: datetime | None = None
+        self._next_reload = 0.0
+        self._next_full_reload = 0.0
+
+    def __contains__(self, token_hash: bytes) -> bool:
+        return token_hash in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, token_hash: bytes, expiration_date: datetime) -> None:
+        self._revoked[token_hash] = expiration_date.timestamp()
+
+    def needs_reload(self) -> bool:
+        return time.monotonic() >= self._next_reload
+
+    async def reload(self, repository: "AccessTokenRepository") -> None:
+        now_monotonic = time.monotonic()
+        self._next_reload = now_monotonic + self.reload_interval
+        since = None
+        if now_monotonic >= self._next_full_reload:
+            self._next_full_reload = now_monotonic + self.full_reload_interval
+        elif self._last_revoked_at is not None:
+            since = self._last_revoked_at - self.overlap
+
+        for token_hash, expiration_date, revoked_at in await repository.list_revoked(since=since):
+            self.add(token_hash, expiration_date)
+            if self._last_revoked_at is None or revoked_at > self._last_revoked_at:
+                self._last_revoked_at = revoked_at
+
+        now = datetime.now(tz=timezone.utc).timestamp()
+        self._revoked = {
+            token_id: expires_at
+            for token_id, expires_at in self._revoked.items()
+            if expires_at > now
+        }
+
+
+revoked_tokens = RevocationSet(
+    settings.TOKEN_REVOCATION_RELOAD_INTERVAL,
+    settings.TOKEN_REVOCATION_RELOAD_MARGIN,
+    settings.TOKEN_REVOCATION_FULL_RELOAD_INTERVAL,
+)
@@ -1,5 +1,10 @@
+import base64
+import hashlib
+import hmac
 import secrets
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from uuid import UUID
 
 from passlib.context import CryptContext
 
@@ -8,6 +13,15 @@ from chronal_api.settings import get_app_settings
 settings = get_app_settings()
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+SIGNED_TOKEN_PREFIX = "v1."
+
+
+@dataclass(frozen=True, slots=True)
+class SignedToken:
+    token_id: str
+    user_id: UUID
+    expiration_date: datetime
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -23,3 +37,49 @@ def generate_token() -> str:
 
 def generate_token_expiration_date(duration_seconds: int = settings.TOKEN_DURATION) -> datetime:
     return datetime.now(tz=timezone.utc) + timedelta(seconds=duration_seconds)
+
+
+def hash_token(token: str) -> bytes:
+    """32 byte key of a token in `access_tokens`"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _sign(payload: str, secret_key: str) -> bytes:
+    digest = hmac.new(secret_key.encode(), payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=")
+
+
+def generate_signed_token(user_id: UUID, expiration_date: datetime) -> str:
+    """`v1.<token id>.<user id>.<expiration timestamp>.<HMAC-SHA256 signature>`"""
+    if settings.TOKEN_SECRET_KEY is None:
+        raise RuntimeError("TOKEN_SECRET_KEY is not set")
+
+    payload = (
+        f"{SIGNED_TOKEN_PREFIX}{generate_token()}.{user_id.hex}.{int(expiration_date.timestamp())}"
+    )
+    return f"{payload}.{_sign(payload, settings.TOKEN_SECRET_KEY).decode()}"
+
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(SIGNED_TOKEN_PREFIX)
+
+
+def decode_signed_token(token: str) -> SignedToken | None:
+    """Returns `None` if the token is malformed or its signature does not match"""
+    payload, _, signature = token.rpartition(".")
+    if settings.TOKEN_SECRET_KEY is None or not is_signed_token(payload):
+        return None
+    # bytes, `compare_digest` raises TypeError for a str with non-ASCII characters
+    expected_signature = _sign(payload, settings.TOKEN_SECRET_KEY)
+    if not hmac.compare_digest(signature.encode(), expected_signature):
+        return None
+
+    try:
+        token_id, user_id, timestamp = payload.removeprefix(SIGNED_TOKEN_PREFIX).split(".")
+        return SignedToken(
+            token_id=token_id,
+            user_id=UUID(hex=user_id),
+            expiration_date=datetime.fromtimestamp(int(timestamp), tz=timezone.utc),
+        )
+    except ValueError:
+        return None
@@ -1,43 +1,162 @@
+import dataclasses
 import uuid
 from datetime import datetime, timezone
 
 from chronal_api.lib.service import Service
+from chronal_api.settings import get_app_settings
 from chronal_api.users.models import User
 
-from . import exceptions, models, repository, security
+from . import (
+    cache,
+    exceptions,
+    hashing,
+    models,
+    repository,
+    revocation,
+    security,
+    sliding,
+)
+from .principal import Principal
+
+settings = get_app_settings()
 
 
 class AuthService(Service[models.AccessToken, uuid.UUID]):
-    def __init__(self, repository: repository.AccessTokenRepository) -> None:
+    def __init__(
+        self,
+        repository: repository.AccessTokenRepository,
+        token_cache: cache.TokenCache | None = None,
+        revoked_tokens: revocation.RevocationSet | None = None,
+        expiry_extensions: sliding.ExpiryExtensions | None = None,
+    ) -> None:
         """AuthService"""
         self.repository = repository
+        self.token_cache = token_cache if token_cache is not None else cache.token_cache
+        self.revoked_tokens = (
+            revoked_tokens if revoked_tokens is not None else revocation.revoked_tokens
+        )
+        self.expiry_extensions = (
+            expiry_extensions if expiry_extensions is not None else sliding.expiry_extensions
+        )
 
     async def create_token(self, user: User) -> models.AccessToken:
+        if settings.TOKEN_FORMAT == "signed":
+            return await self.repository.create_signed_token(user)
         return await self.repository.create_token(user)
 
     async def delete_token(self, access_token: str) -> None:
+        self.token_cache.invalidate(access_token)
+
+        if security.is_signed_token(access_token):
+            # signed tokens are verified without a lookup, the row is kept to tell other
+            # processes about the revocation until the token expires
+            signed_token = security.decode_signed_token(access_token)
+            if signed_token is None or not await self.repository.revoke_token(
+                access_token, datetime.now(tz=timezone.utc)
+            ):
+                raise exceptions.InvalidAccessToken()
+            self.revoked_tokens.add(
+                security.hash_token(access_token), signed_token.expiration_date
+            )
+            return
+
         token_exists = await self.repository.exists(access_token=access_token)
         if token_exists:
             await self.repository.delete(id=access_token)
         else:
             raise exceptions.InvalidAccessToken()
 
+    async def delete_user_tokens(
+        self, user_id: uuid.UUID, created_before: datetime | None = None
+    ) -> int:
+        """
+        Logs the user out everywhere, or only of the tokens created before
+        `created_before`. The rows are revoked instead of deleted in either `TOKEN_FORMAT`:
+        signed tokens issued before a switch to opaque are still verified by signature,
+        and other processes learn about them from the revoked rows.
+        """
+        revoked = await self.repository.revoke_user_tokens(
+            user_id, datetime.now(tz=timezone.utc), created_before
+        )
+        for token_hash, expiration_date in revoked:
+            self.revoked_tokens.add(token_hash, expiration_date)
+
+        # principals carry no creation date, the ones left valid are reloaded
+        self.token_cache.invalidate_where(lambda principal: principal.id == user_id)
+        return len(revoked)
+
     async def authenticate(self, user: User, plain_password: str) -> User:
-        if not security.verify_password(plain_password, user.hashed_password):
+        if not await hashing.verify_password(plain_password, user.hashed_password):
             raise exceptions.WrongPassword()
         return user
 
-    async def validate_access_token(self, access_token: str) -> models.AccessToken:
-        db_access_token = await self.repository.get_one_or_none(access_token)
+    async def delete_expired_tokens(self, batch_size: int) -> int:
+        return await self.repository.delete_expired(datetime.now(tz=timezone.utc), batch_size)
+
+    async def get_principal(self, access_token: str) -> Principal:
+        if security.is_signed_token(access_token):
+            # revocation is checked on every call, only the email lookup is cached
+            signed_token = await self.validate_signed_access_token(access_token)
+        else:
+            signed_token = None
+
+        principal = self.token_cache.get(access_token)
+        if principal is None:
+            principal = await self._load_principal(access_token, signed_token)
+            self.token_cache.set(access_token, principal, expires_at=principal.expiration_date)
+
+        # the expiry of signed tokens is part of the signature
+        if signed_token is None and settings.TOKEN_SLIDING_EXPIRY:
+            principal = self._extend_expiry(access_token, principal)
+        return principal
+
+    async def _load_principal(
+        self, access_token: str, signed_token: security.SignedToken | None
+    ) -> Principal:
+        if signed_token is not None:
+            email = await self.repository.get_user_email(signed_token.user_id)
+            if email is None:
+                raise exceptions.InvalidAccessToken()
+            return Principal(signed_token.user_id, email, signed_token.expiration_date)
 
-        if db_access_token is None:
+        principal = await self.repository.get_principal(access_token)
+        if principal is None:
+            raise exceptions.InvalidAccessToken()
+        if principal.expiration_date <= datetime.now(tz=timezone.utc):
+            # removed by `tasks.purge_expired_tokens`
+            raise exceptions.ExpiredAccessToken()
+        return principal
+
+    def _extend_expiry(self, access_token: str, principal: Principal) -> Principal:
+        """Written later by `tasks.flush_expiry_extensions`, this process honours it now"""
+        expiration_date = self.expiry_extensions.extend(access_token, principal.expiration_date)
+        if expiration_date is None:
+            return principal
+
+        principal = dataclasses.replace(principal, expiration_date=expiration_date)
+        self.token_cache.set(access_token, principal, expires_at=expiration_date)
+        return principal
+
+    async def get_principal_user(self, principal: Principal) -> User:
+        user = await self.repository.get_user(principal.id)
+        if user is None:
+            raise exceptions.InvalidAccessToken()
+        return user
+
+    async def validate_signed_access_token(self, access_token: str) -> security.SignedToken:
+        signed_token = security.decode_signed_token(access_token)
+        if signed_token is None:
             raise exceptions.InvalidAccessToken()
 
-        if db_access_token.expiration_date <= datetime.now(tz=timezone.utc):
-            # TODO: schedule task to remove expired token
+        if signed_token.expiration_date <= datetime.now(tz=timezone.utc):
             raise exceptions.ExpiredAccessToken()
 
-        return db_access_token
+        if self.revoked_tokens.needs_reload():
+            await self.revoked_tokens.reload(self.repository)
+        if security.hash_token(access_token) in self.revoked_tokens:
+            raise exceptions.InvalidAccessToken()
+
+        return signed_token
 
 
 # TODO: cors/csrf, tests
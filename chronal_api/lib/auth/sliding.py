@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from chronal_api.settings import get_app_settings
+
+from . import security
+from .cache import TTLCache
+
+if TYPE_CHECKING:
+    from .repository import AccessTokenRepository
+
+settings = get_app_settings()
+
+
+class ExpiryExtensions:
+    """
+    Coalesces sliding expiry writes. A token is only extended once less than `threshold`
+    seconds of its lifetime are left and at most once per `min_interval` seconds. New
+    expiration dates stay in memory until `flush` writes all of them in one bulk UPDATE.
+    """
+
+    def __init__(
+        self, duration: float, threshold: float, min_interval: float, maxsize: int
+    ) -> None:
+        if maxsize < 1:
+            # a cache that holds nothing would extend a token on every request
+            raise ValueError(f"maxsize must be positive, found: {maxsize!r}")
+
+        self.duration = timedelta(seconds=duration)
+        self.threshold = timedelta(seconds=threshold)
+        self._pending: dict[bytes, datetime] = {}  # token hash -> new expiration date
+        self._recent: TTLCache[bytes, datetime] = TTLCache(maxsize, min_interval)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def extend(self, access_token: str, expiration_date: datetime) -> datetime | None:
+        """Returns the new expiration date if the token is due for an extension"""
+        now = datetime.now(tz=timezone.utc)
+        if expiration_date - now >= self.threshold:
+            return None
+
+        token_hash = security.hash_token(access_token)
+        if self._recent.get(token_hash) is not None:
+            return None
+
+        new_expiration_date = now + self.duration
+        self._pending[token_hash] = new_expiration_date
+        self._recent.set(token_hash, new_expiration_date)
+        return new_expiration_date
+
+    async def flush(self, repository: "AccessTokenRepository") -> int:
+        """Writes pending extensions, they are kept for the next flush if that fails"""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            await repository.extend_expiration(pending)
+        except BaseException:
+            for token_hash, expiration_date in pending.items():
+                self._pending.setdefault(token_hash, expiration_date)
+            raise
+        return len(pending)
+
+
+expiry_extensions = ExpiryExtensions(
+    settings.TOKEN_DURATION,
+    settings.TOKEN_SLIDING_THRESHOLD,
+    settings.TOKEN_SLIDING_MIN_INTERVAL,
+    settings.TOKEN_SLIDING_MAX_TOKENS,
+)
@@ -0,0 +1,74 @@
+import asyncio
+import random
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from chronal_api.log import get_logger
+
+from . import repository, service, sliding
+
+logger = get_logger()
+
+
+async def purge_expired_tokens(
+    sessionmaker: async_sessionmaker[AsyncSession], batch_size: int
+) -> int:
+    """
+    Deletes expired access tokens `batch_size` rows at a time. Every batch commits on
+    its own, so no write lock is held for longer than a single small DELETE and other
+    writers (SQLite allows one at a time) get in between batches.
+    """
+    deleted = 0
+    while True:
+        async with sessionmaker() as session:
+            async with session.begin():
+                auth_service = service.AuthService(repository.AccessTokenRepository(session))
+                batch_deleted = await auth_service.delete_expired_tokens(batch_size)
+
+        deleted += batch_deleted
+        if batch_deleted < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+async def run_token_purge(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    interval: float,
+    jitter: float,
+    batch_size: int,
+) -> None:
+    """Runs `purge_expired_tokens` forever, the jitter spreads out purges of several workers"""
+    while True:
+        await asyncio.sleep(interval + random.uniform(0, jitter))
+        try:
+            deleted = await purge_expired_tokens(sessionmaker, batch_size)
+        except Exception:
+            logger.exception("Purging expired access tokens failed")
+        else:
+            logger.info("Purged %d expired access tokens", deleted)
+
+
+async def flush_expiry_extensions(
+    sessionmaker: async_sessionmaker[AsyncSession], extensions: sliding.ExpiryExtensions
+) -> int:
+    """Writes the sliding expiry extensions collected since the previous flush"""
+    async with sessionmaker() as session:
+        async with session.begin():
+            return await extensions.flush(repository.AccessTokenRepository(session))
+
+
+async def run_expiry_flush(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    extensions: sliding.ExpiryExtensions,
+    interval: float,
+) -> None:
+    """Runs `flush_expiry_extensions` forever, flushes once more when cancelled"""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await flush_expiry_extensions(sessionmaker, extensions)
+            except Exception:
+                logger.exception("Writing access token expiry extensions failed")
+    finally:
+        await flush_expiry_extensions(sessionmaker, extensions)
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+from chronal_api.settings import LoginThrottleSettings
+
+from . import exceptions
+
+K = TypeVar("K")
+
+
+class TokenBucketLimiter(Generic[K]):
+    """
+    One token bucket per key holding up to `burst` tokens, refilled at `rate` tokens per
+    second. Buckets are kept in least recently used order: buckets idle long enough to be
+    full again are dropped (a full bucket is the same as a missing one) and past `maxsize`
+    the least recently used one is evicted, so memory stays bounded under key floods.
+    """
+
+    def __init__(self, burst: int, rate: float, maxsize: int) -> None:
+        self.burst = burst
+        self.rate = rate
+        self.maxsize = maxsize
+        self._idle_after = burst / rate
+        self._buckets: OrderedDict[K, tuple[float, float]] = OrderedDict()  # tokens, updated
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: K) -> float:
+        """Takes a token, returns 0 or the seconds until the bucket has one again"""
+        now = time.monotonic()
+        self._drop_idle(now)
+
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def _drop_idle(self, now: float) -> None:
+        while self._buckets:
+            _, updated = next(iter(self._buckets.values()))
+            if now - updated < self._idle_after:
+                return
+            self._buckets.popitem(last=False)
+
+
+class LoginThrottle:
+    """Limits login attempts per client IP and per email before any password is checked"""
+
+    def __init__(self, settings: LoginThrottleSettings) -> None:
+        self.settings = settings
+        self.by_ip: TokenBucketLimiter[str] = TokenBucketLimiter(
+            settings.ip_burst, settings.ip_rate, settings.max_keys
+        )
+        self.by_email: TokenBucketLimiter[str] = TokenBucketLimiter(
+            settings.email_burst, settings.email_rate, settings.max_keys
+        )
+
+    def check(self, ip: str | None, email: str) -> None:
+        if not self.settings.enabled:
+            return
+
+        if ip is not None:
+            retry_after = self.by_ip.consume(ip)
+            if retry_after:
+                raise exceptions.TooManyLoginAttempts(retry_after)
+
+        retry_after = self.by_email.consume(email.lower())
+        if retry_after:
+            raise exceptions.TooManyLoginAttempts(retry_after)
+
+
+login_throttle = LoginThrottle(LoginThrottleSettings())
@@ -1,14 +1,62 @@
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, AsyncGenerator, Callable, TypeVar
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .engine import sessionmaker
+from . import engine
 
+EndpointT = TypeVar("EndpointT", bound=Callable[..., object])
 
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    session = sessionmaker()
-    async with sessionmaker() as session:
+READ_ONLY_ATTR = "__read_only__"
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+def read_only(endpoint: EndpointT) -> EndpointT:
+    """Marks a route that never writes, its `db_session` is a `db_read_session`"""
+    setattr(endpoint, READ_ONLY_ATTR, True)
+    return endpoint
+
+
+def read_write(endpoint: EndpointT) -> EndpointT:
+    """Marks a GET route that writes, its `db_session` runs in a transaction"""
+    setattr(endpoint, READ_ONLY_ATTR, False)
+    return endpoint
+
+
+def is_read_only(request: Request) -> bool:
+    """Routes marked with `read_only` or `read_write`, otherwise GET and HEAD ones"""
+    default = request.method in READ_ONLY_METHODS
+    return getattr(request.scope.get("endpoint"), READ_ONLY_ATTR, default)
+
+
+async def db_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session that is never committed. On PostgreSQL it runs in autocommit, which saves
+    the BEGIN and COMMIT round trips. On SQLite a SELECT starts no transaction anyway,
+    and with `DB_SQLITE_READERS` set the connections are `query_only`.
+    """
+    async with engine.get_read_sessionmaker()() as session:
+        yield session
+
+
+async def db_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Transaction for a route on a read session that writes at the end, e.g. a login that
+    verifies the password first. It connects at its first statement, so the single
+    SQLite writer is only held from there to the commit.
+    """
+    async with engine.get_sessionmaker()() as session:
+        async with session.begin():
+            yield session
+
+
+async def db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if is_read_only(request):
+        async with engine.get_read_sessionmaker()() as session:
+            yield session
+        return
+
+    async with engine.get_sessionmaker()() as session:
         async with session.begin():
             yield session
 
@@ -16,3 +64,5 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 # Annotated
 
 DbSession = Annotated[AsyncSession, Depends(db_session)]
+DbReadSession = Annotated[AsyncSession, Depends(db_read_session)]
+DbWriteSession = Annotated[AsyncSession, Depends(db_write_session)]
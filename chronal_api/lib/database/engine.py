@@ -1,8 +1,28 @@
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+import asyncio
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Any, Callable
+
+from sqlalchemy import (
+    AsyncAdaptedQueuePool,
+    Connection,
+    MetaData,
+    NullPool,
+    QueuePool,
+    StaticPool,
+    event,
+    make_url,
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
-from chronal_api.settings import DatabaseSettings
+from chronal_api.settings import DatabaseSettings, get_db_settings
 
 DB_NAMING_CONVENTION = {
     "ix": "%(column_0_label)s_idx",
@@ -12,7 +32,6 @@ DB_NAMING_CONVENTION = {
     "pk": "%(table_name)s_pkey",
 }
 
-db_settings = DatabaseSettings()
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)  # pyright: ignore
 
 
@@ -20,6 +39,153 @@ class Base(AsyncAttrs, DeclarativeBase):
     metadata = metadata
 
 
-engine = create_async_engine(db_settings.get_url().render_as_string(), echo=True)
+def create_engine(settings: DatabaseSettings, *, read_only: bool = False) -> AsyncEngine:
+    """
+    Async engine with the pool, logging and driver options of `settings`.
+
+    With `SQLITE_READERS` set a SQLite engine is the single writer, one connection that
+    takes the write lock up front and that write transactions queue for. `read_only`
+    builds the pool of `SQLITE_READERS` `query_only` connections next to it instead.
+    """
+    # re-parsed so that the SQLite path given as HOST becomes the database
+    url = make_url(settings.get_url().render_as_string(hide_password=False))
+    sqlite = url.get_backend_name() == "sqlite"
+    split = sqlite and settings.SQLITE_READERS is not None
+    kwargs: dict[str, Any] = {
+        "echo": settings.ECHO,
+        "pool_pre_ping": settings.POOL_PRE_PING,
+        "pool_recycle": settings.POOL_RECYCLE,
+    }
+
+    pool_class = settings.POOL_CLASS
+    if split:
+        pool_class = "queue"
+    elif pool_class is None:
+        in_memory = sqlite and url.database in (None, "", ":memory:")
+        pool_class = "static" if in_memory else "queue"
+
+    if pool_class == "queue":
+        pool_size, max_overflow = settings.POOL_SIZE, settings.MAX_OVERFLOW
+        if split:
+            # checkouts of a full pool wait, in order, in an asyncio queue for POOL_TIMEOUT
+            pool_size = (settings.SQLITE_READERS or 1) if read_only else 1
+            max_overflow = 0
+        # aiosqlite defaults to a new connection, and thread, per checkout for file databases
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.POOL_TIMEOUT,
+        )
+    elif pool_class == "null":
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs["poolclass"] = StaticPool
+
+    if settings.STATEMENT_CACHE_SIZE is not None and url.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {"statement_cache_size": settings.STATEMENT_CACHE_SIZE}
+
+    engine = create_async_engine(url, **kwargs)
+    if sqlite:
+        pragmas = settings.sqlite_pragmas()
+        if read_only:
+            pragmas["query_only"] = "ON"
+        event.listen(engine.sync_engine, "connect", sqlite_pragmas_listener(pragmas))
+        if split and not read_only:
+            event.listen(engine.sync_engine, "connect", _disable_driver_transactions)
+            event.listen(engine.sync_engine, "begin", _begin_immediate)
+    return engine
+
+
+def sqlite_pragmas_listener(pragmas: dict[str, str | int]) -> Callable[..., None]:
+    """`connect` event listener applying `pragmas`, see `DatabaseSettings.sqlite_pragmas`"""
+
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
+def _disable_driver_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+    # sqlite3 would only BEGIN (deferred) before the first write
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn: Connection) -> None:
+    # takes the write lock at BEGIN, a deferred transaction that reads first can fail to
+    # upgrade its lock with SQLITE_BUSY while another process writes
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# Created on first use, importing models does not load the driver or read `DB_*` settings
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    return create_engine(get_db_settings())
+
+
+@lru_cache(maxsize=1)
+def get_read_engine() -> AsyncEngine:
+    """Same as `get_engine()` unless SQLite readers are configured"""
+    settings = get_db_settings()
+    if settings.DB == "sqlite" and settings.SQLITE_READERS is not None:
+        return create_engine(settings, read_only=True)
+    return get_engine()
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
+
+
+@lru_cache(maxsize=1)
+def get_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Sessions on the read engine for `db_read_session`. They run in autocommit, so the
+    driver sends no BEGIN/COMMIT and each statement reads its own snapshot.
+
+    SQLite keeps its isolation level: sqlite3 only sends BEGIN before a write, and the pool
+    would reset autocommit connections with an extra PRAGMA when they are returned.
+    """
+    read_engine = get_read_engine()
+    if read_engine.dialect.name != "sqlite":
+        read_engine = read_engine.execution_options(isolation_level="AUTOCOMMIT")
+    return async_sessionmaker(read_engine, expire_on_commit=False)
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Opens up to `connections` pooled connections at once and returns them to the pool"""
+    if isinstance(engine.pool, NullPool):
+        return
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+    elif isinstance(engine.pool, StaticPool):
+        connections = min(connections, 1)
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+
+
+async def warm_up_engines() -> None:
+    settings = get_db_settings()
+    connections = settings.POOL_WARMUP if settings.POOL_WARMUP is not None else settings.POOL_SIZE
+    for engine in {get_engine(), get_read_engine()}:
+        await warm_up(engine, connections)
+
+
+async def dispose_engines() -> None:
+    """Closes pooled connections, the next `get_engine()` creates a new engine"""
+    if get_engine.cache_info().currsize:
+        for engine in {get_engine(), get_read_engine()}:
+            await engine.dispose()
 
-sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    for getter in (get_engine, get_read_engine, get_sessionmaker, get_read_sessionmaker):
+        getter.cache_clear()
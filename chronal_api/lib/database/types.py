@@ -21,6 +21,10 @@ class UUID(sqla_types.TypeDecorator):
     impl = UUIDChar
     cache_ok = True
 
+    @property
+    def python_type(self) -> type[uuid.UUID]:
+        return uuid.UUID
+
     def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
         return dialect.type_descriptor(sqla_CHAR(36))
 
@@ -42,6 +46,10 @@ class DateTimeUTC(sqla_types.TypeDecorator):  # pyright: ignore
     impl = sqla_TIMESTAMP
     cache_ok = True
 
+    @property
+    def python_type(self) -> type[datetime.datetime]:
+        return datetime.datetime
+
     def process_bind_param(self, value: datetime.datetime | None, dialect: Dialect) -> Any:
         if not isinstance(value, datetime.datetime):
             if value is None:
@@ -8,3 +8,7 @@ class Conflict(RepositoryException):
 
 class NotFound(RepositoryException):
     """Raised when a resource is not found"""
+
+
+class InvalidCursor(RepositoryException):
+    """Raised when a pagination cursor can not be decoded"""
@@ -0,0 +1,65 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from .exceptions import InvalidCursor
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        ((type_, raw),) = value.items()
+        if type_ == "datetime":
+            return datetime.fromisoformat(raw)
+        if type_ == "uuid":
+            return UUID(raw)
+        raise ValueError(f"Unknown cursor value type: {type_!r}")
+    return value
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encodes keyset values of the last row of a page into an opaque cursor token"""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _matches_type(value: Any, type_: type | None) -> bool:
+    if type_ is None:
+        return True
+    if isinstance(value, bool) and type_ is not bool:
+        return False
+    if not isinstance(value, type_):
+        return False
+    # cursors are encoded from `DateTimeUTC` values, a naive datetime can not be compared
+    return not isinstance(value, datetime) or value.tzinfo is not None
+
+
+def decode_cursor(cursor: str, types: Sequence[type | None] | None = None) -> list[Any]:
+    """
+    Decodes a cursor token created by `encode_cursor`. With `types`, one per keyset
+    column (`None` if unknown), the values must match them in number and type.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            raise ValueError("Cursor must encode a list")
+        values = [_decode_value(value) for value in values]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from exc
+
+    if types is not None and (
+        len(values) != len(types) or not all(map(_matches_type, values, types))
+    ):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    return values
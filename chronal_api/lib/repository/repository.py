@@ -1,7 +1,7 @@
 # mostly stolen from https://github.com/litestar-org/litestar/blob/2744bf4b8fb7d8b8886229aa71fa1ee8d9a3ffde/litestar/contrib/repository/abc/_async.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncIterator, Generic, TypeVar
 
 from sqlalchemy import Column
 
@@ -51,15 +51,16 @@ class Repository(Generic[T, U], ABC):
         """
 
     @abstractmethod
-    async def create_many(self, data: list[T]) -> list[T]:
+    async def create_many(self, data: list[T], **kwargs: Any) -> list[T] | list[U]:
         """
         Create many records in the table.
 
         Args:
             data (list[T]): The data to create the records with.
+            **kwargs (Any): Implementation specific options, e.g. `bulk`.
 
         Returns:
-            list[T]: The created records.
+            list[T] | list[U]: The created records, or their IDs in bulk mode.
         """
 
     @abstractmethod
@@ -78,15 +79,16 @@ class Repository(Generic[T, U], ABC):
         """
 
     @abstractmethod
-    async def delete_many(self, ids: list[U]) -> list[T]:
+    async def delete_many(self, ids: list[U], **kwargs: Any) -> list[T] | int:
         """
-        Delete many records from the table.
+        Delete many records from the table in bulk.
 
         Args:
             ids (list[U]): The IDs of the records to delete.
+            **kwargs (Any): Implementation specific options, e.g. `return_rows`.
 
         Returns:
-            list[T]: The deleted records.
+            list[T] | int: The deleted records, or their count if `return_rows` is `False`.
         """
 
     @abstractmethod
@@ -172,6 +174,37 @@ class Repository(Generic[T, U], ABC):
             tuple[list[T], int]: The records and the count.
         """
 
+    @abstractmethod
+    async def paginate(
+        self, limit: int, cursor: str | None = None, **kwargs: Any
+    ) -> tuple[list[T], str | None]:
+        """
+        List a page of records from the table.
+
+        Args:
+            limit (int): The maximum number of records in the page.
+            cursor (str | None): The cursor of the page, `None` for the first page.
+            **kwargs (Any): The query parameters to list the records with.
+
+        Returns:
+            tuple[list[T], str | None]: The records and the cursor of the next page.
+
+        Raises:
+            InvalidCursor: If the cursor is not valid.
+        """
+
+    @abstractmethod
+    def stream_(self, **kwargs: Any) -> AsyncIterator[T]:
+        """
+        Iterate over records from the table without loading all of them at once.
+
+        Args:
+            **kwargs (Any): The query parameters to list the records with.
+
+        Returns:
+            AsyncIterator[T]: The records.
+        """
+
     @abstractmethod
     async def update(self, data: T) -> T:
         """
@@ -188,36 +221,42 @@ class Repository(Generic[T, U], ABC):
         """
 
     @abstractmethod
-    async def update_many(self, data: list[T]) -> list[T]:
+    async def update_many(self, data: list[T], **kwargs: Any) -> list[T]:
         """
-        Update many records in the table.
+        Update many records in the table in bulk.
 
         Args:
             data (list[T]): The data to update the records with.
+            **kwargs (Any): Implementation specific options, e.g. `chunk_size`.
 
         Returns:
             list[T]: The updated records.
+
+        Raises:
+            NotFoundError: If any of the records is not found.
         """
 
     @abstractmethod
-    async def upsert(self, data: T) -> T:
+    async def upsert(self, data: T, **kwargs: Any) -> T:
         """
         Upsert a record in the table.
 
         Args:
             data (T): Instance of the model to upsert.
+            **kwargs (Any): Implementation specific options, e.g. `conflict_target`.
 
         Returns:
             T: The upserted record.
         """
 
     @abstractmethod
-    async def upsert_many(self, data: list[T]) -> list[T]:
+    async def upsert_many(self, data: list[T], **kwargs: Any) -> list[T]:
         """
-        Upsert many records in the table.
+        Upsert many records in the table in bulk.
 
         Args:
             data (list[T]): List of instances of the model to upsert.
+            **kwargs (Any): Implementation specific options, e.g. `chunk_size`.
 
         Returns:
             list[T]: The upserted records.
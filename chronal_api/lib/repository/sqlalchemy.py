@@ -1,22 +1,33 @@
-from typing import TYPE_CHECKING, Any, Iterable, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Literal, Sequence, TypeVar
 
 from sqlalchemy import Select, delete
 from sqlalchemy import func as sqla_func
-from sqlalchemy import select
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy import insert, literal_column, select, tuple_, update
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
-from .exceptions import RepositoryException
+from .exceptions import NotFound, RepositoryException
+from .pagination import decode_cursor, encode_cursor
 from .repository import Repository
-from .utils import sql_error_handler
+from .utils import chunked, dialect_insert, max_bind_params, python_type, sql_error_handler
 
 T = TypeVar("T")
 U = TypeVar("U")
 SelectT = TypeVar("SelectT", bound=Select[Any])
+# column names or a schema class with `model_fields` (pydantic) to load
+Projection = Iterable[str] | type[Any]
 
 
 class SQLAlchemyRepository(Repository[T, U]):
+    chunk_size: int = 1000
+    cursor_columns: tuple[str, ...] = ("created_at", "id")
+    count_strategy: Literal["separate", "window", "subquery"] = "separate"
+
     def __init__(
         self,
         session: "AsyncSession",
@@ -75,6 +86,31 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         return None
 
+    async def _reload_many(
+        self,
+        instances: Sequence[T],
+        attribute_names: Iterable[str] | None = None,
+        with_for_update: bool | None = None,
+    ) -> list[T]:
+        ids = [getattr(instance, self.model_id_attr_name) for instance in instances]
+        statement = (
+            select(self.model)
+            .where(self.model_id_attr.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        if attribute_names is not None:
+            statement = statement.options(
+                load_only(*(getattr(self.model, name) for name in attribute_names))
+            )
+        if with_for_update:
+            statement = statement.with_for_update()
+
+        loaded = {
+            getattr(instance, self.model_id_attr_name): instance
+            for instance in await self.session.scalars(statement)
+        }
+        return [loaded[id] for id in ids if id in loaded]
+
     # Statement methods
 
     async def _where_from_kwargs(self, statement: SelectT, **kwargs: Any) -> SelectT:
@@ -82,6 +118,55 @@ class SQLAlchemyRepository(Repository[T, U]):
             statement = statement.where(getattr(self.model, k) == v)
         return statement
 
+    def _project(
+        self, statement: SelectT, projection: Projection | None, *required: str
+    ) -> SelectT:
+        if projection is None:
+            return statement
+
+        column_keys = {attr.key for attr in sqla_inspect(self.model).column_attrs}
+        if hasattr(projection, "model_fields"):
+            # schema fields without a matching column (relationships, computed) are skipped
+            names = [name for name in projection.model_fields if name in column_keys]
+        else:
+            names = list(projection)
+            if unknown := [name for name in names if name not in column_keys]:
+                raise RepositoryException(
+                    f"Projection columns must be columns of {self.model.__name__}, "
+                    f"found: {unknown!r}"
+                )
+
+        names = list(dict.fromkeys([*names, *required]))
+        return statement.options(
+            load_only(*(getattr(self.model, name) for name in names), raiseload=True)
+        )
+
+    def _column_values(self, instance: T) -> dict[str, Any]:
+        state = sqla_inspect(instance)
+        return {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+
+    @staticmethod
+    def _conflict_key(
+        values: dict[str, Any], conflict_keys: list[str], default: Any = None
+    ) -> Any:
+        """`conflict_keys` values of a row, `default` if it does not provide all of them"""
+        if not all(key in values for key in conflict_keys):
+            return default
+        return tuple(values[key] for key in conflict_keys)
+
+    def _changed_column_values(self, instance: T) -> dict[str, Any]:
+        state = sqla_inspect(instance)
+        column_keys = {attr.key for attr in state.mapper.column_attrs}
+        keys = state.committed_state.keys() if state.has_identity else state.dict.keys()
+
+        values = {key: state.dict[key] for key in keys if key in column_keys and key in state.dict}
+        values[self.model_id_attr_name] = getattr(instance, self.model_id_attr_name)
+        return values
+
     # Repository methods
 
     async def count(self, **kwargs: Any) -> int:
@@ -115,17 +200,64 @@ class SQLAlchemyRepository(Repository[T, U]):
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
-    async def create_many(self, data: list[T], **kwargs: Any) -> list[T]:
-        auto_commit = kwargs.pop("autocommit", self.auto_commit)
-        auto_expunge = kwargs.pop("autocommit", self.auto_expunge)
+    async def create_many(
+        self, data: Iterable[T | dict[str, Any]], **kwargs: Any
+    ) -> list[T] | list[U]:
+        """
+        Create many records in the table.
+
+        In `bulk` mode `data` is consumed `chunk_size` items at a time, each chunk being
+        one batched `INSERT ... RETURNING <primary key>`. No instances are attached to the
+        session, so memory stays bounded by the chunk size.
+
+        Args:
+            data (Iterable[T | dict[str, Any]]): The instances to create, `bulk` mode also
+            accepts any iterable of model instances or attribute dicts.
+            **kwargs (Any): `bulk`, `chunk_size` and the usual `auto_*` overrides.
+
+        Returns:
+            list[T] | list[U]: The created records, or their primary keys in `bulk` mode.
+        """
+        auto_commit = kwargs.pop("auto_commit", self.auto_commit)
+        auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        chunk_size = kwargs.pop("chunk_size", self.chunk_size)
 
+        if kwargs.pop("bulk", False):
+            return await self._bulk_insert(data, chunk_size=chunk_size, auto_commit=auto_commit)
+
+        data = list(data)
         async with sql_error_handler():
             self.session.add_all(data)
             await self._flush_or_commit(auto_commit=auto_commit)
-            for d in data:
-                await self._expunge(d, auto_expunge=auto_expunge)
+            if auto_expunge:
+                for d in data:
+                    self.session.expunge(d)
         return data
 
+    async def _bulk_insert(
+        self,
+        data: Iterable[T | dict[str, Any]],
+        chunk_size: int,
+        auto_commit: bool | None = None,
+    ) -> list[U]:
+        # `sort_by_parameter_order` would fall back to a statement per row for
+        # autoincrement keys on SQLite, ids come back in the order reported by RETURNING
+        statement = insert(self.model).returning(self.model_id_attr)
+
+        ids: list[U] = []
+        async with sql_error_handler():
+            for chunk in chunked(data, chunk_size):
+                rows = [d if isinstance(d, dict) else self._column_values(d) for d in chunk]
+                result = await self.session.execute(
+                    statement,
+                    rows,
+                    execution_options={"insertmanyvalues_page_size": chunk_size},
+                )
+                ids.extend(result.scalars())
+
+            await self._flush_or_commit(auto_commit=auto_commit)
+        return ids
+
     async def delete(
         self,
         id: U,
@@ -146,16 +278,39 @@ class SQLAlchemyRepository(Repository[T, U]):
         *,
         auto_commit: bool | None = None,
         auto_expunge: bool | None = None,
-    ) -> list[T]:
+        return_rows: bool = True,
+        chunk_size: int | None = None,
+    ) -> list[T] | int:
+        """
+        Delete many records from the table with one `DELETE ... WHERE id IN (...)` per chunk.
+
+        Args:
+            ids (list[U]): The IDs of the records to delete.
+            return_rows (bool): Whether or not to return the deleted records. When `False`
+            only the number of deleted rows is returned and no instances are loaded.
+            chunk_size (int | None): The number of IDs per statement, defaults to the
+            bind parameter limit of the dialect.
+
+        Returns:
+            list[T] | int: The deleted records or their count.
+        """
         async with sql_error_handler():
+            if chunk_size is None:
+                chunk_size = max_bind_params(self.session.bind.dialect)
+
             instances: list[T] = []
-            for id in ids:
-                instances.extend(
-                    await self.session.scalars(
-                        delete(self.model).where(self.model_id_attr == id).returning(self.model)
-                    )
-                )
+            deleted = 0
+            for chunk in chunked(ids, chunk_size):
+                statement = delete(self.model).where(self.model_id_attr.in_(chunk))
+                if return_rows:
+                    instances.extend(await self.session.scalars(statement.returning(self.model)))
+                else:
+                    deleted += (await self.session.execute(statement)).rowcount
+
             await self._flush_or_commit(auto_commit=auto_commit)
+            if not return_rows:
+                return deleted
+
             for instance in instances:
                 await self._expunge(
                     instance,
@@ -167,14 +322,25 @@ class SQLAlchemyRepository(Repository[T, U]):
         """
         Check if a record exists in the table. Optionally filter by kwargs.
 
+        Uses `SELECT EXISTS (SELECT 1 ... LIMIT 1)`, which stops at the first match
+        instead of counting every matching row.
+
         Args:
             **kwargs (Any): The kwargs to filter by.
 
         Returns:
             bool: Whether or not the record exists.
         """
-        exists = await self.count(**kwargs)
-        return exists > 0
+        statement = kwargs.pop("statement", self.statement)
+        statement = (
+            statement.with_only_columns(literal_column("1")).select_from(self.model).limit(1)
+        )
+
+        async with sql_error_handler():
+            statement = await self._where_from_kwargs(statement, **kwargs)
+
+            result = await self.session.execute(select(statement.exists()))
+            return bool(result.scalar_one())
 
     async def get(self, id: U, auto_expunge: bool | None = None, **kwargs: Any) -> T:
         """
@@ -182,12 +348,14 @@ class SQLAlchemyRepository(Repository[T, U]):
 
         Args:
             id (U): The ID of the record to get.
-            **kwargs (Any): The kwargs to filter by.
+            **kwargs (Any): The kwargs to filter by and `projection`.
 
         Returns:
             T: The record.
         """
+        projection = kwargs.pop("projection", None)
         statement = kwargs.pop("statement", self.statement)
+        statement = self._project(statement, projection)
         statement = await self._where_from_kwargs(
             statement, **kwargs, **{self.model_id_attr_name: id}
         )
@@ -244,13 +412,15 @@ class SQLAlchemyRepository(Repository[T, U]):
         List records from the table. Optionally filter by kwargs.
 
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            **kwargs (Any): The kwargs to filter by and `projection`.
 
         Returns:
             list[T]: The records.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        projection = kwargs.pop("projection", None)
         statement = kwargs.pop("statement", self.statement)
+        statement = self._project(statement, projection)
         statement = await self._where_from_kwargs(statement, **kwargs)
 
         async with sql_error_handler():
@@ -267,25 +437,140 @@ class SQLAlchemyRepository(Repository[T, U]):
         """
         List records from the table. Optionally filter by kwargs.
 
+        `count_strategy` picks how the total is fetched:
+            - "separate": a `COUNT(*)` query followed by the row query.
+            - "window": one statement with `COUNT(*) OVER ()`. The database has to buffer
+            every matching row before applying `limit`, so it only pays off when round
+            trips are expensive.
+            - "subquery": one statement with an uncorrelated `(SELECT COUNT(*) ...)` column.
+        Single statement strategies fall back to a `COUNT(*)` query for empty pages.
+
         Args:
-            **kwargs (Any): The kwargs to filter by.
+            **kwargs (Any): The kwargs to filter by, `limit`, `offset` and `count_strategy`.
 
         Returns:
-            tuple[list[T], int]: The records and the count of the records.
+            tuple[list[T], int]: The records and the count of all matching records.
         """
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        count_strategy = kwargs.pop("count_strategy", self.count_strategy)
+        limit = kwargs.pop("limit", None)
+        offset = kwargs.pop("offset", None)
         statement = kwargs.pop("statement", self.statement)
         statement = await self._where_from_kwargs(statement, **kwargs)
         count_statement = statement.with_only_columns(sqla_func.count()).select_from(self.model)
+        statement = statement.limit(limit).offset(offset)
+
+        if count_strategy == "window":
+            total_count = sqla_func.count().over()
+        elif count_strategy == "subquery":
+            total_count = count_statement.scalar_subquery()
+        elif count_strategy != "separate":
+            raise RepositoryException(
+                "Count strategy must be 'separate', 'window' or 'subquery', "
+                f"found: {count_strategy!r}"
+            )
 
         async with sql_error_handler():
-            count_result = (await self.session.execute(count_statement)).scalar_one()
-            items = list((await self.session.execute(statement)).scalars())
+            if count_strategy == "separate":
+                count_result = (await self.session.execute(count_statement)).scalar_one()
+                items = list((await self.session.execute(statement)).scalars())
+            else:
+                rows = (
+                    await self.session.execute(
+                        statement.add_columns(total_count.label("total_count"))
+                    )
+                ).all()
+                items = [row[0] for row in rows]
+                count_result = (
+                    rows[0].total_count
+                    if rows
+                    else (await self.session.execute(count_statement)).scalar_one()
+                )
 
             for item in items:
                 await self._expunge(item, auto_expunge=auto_expunge)
             return (items, count_result)
 
+    async def paginate(
+        self, limit: int, cursor: str | None = None, **kwargs: Any
+    ) -> tuple[list[T], str | None]:
+        """
+        Keyset paginate records of the table ordered by `cursor_columns`. Optionally filter
+        by kwargs. Every page is a single range scan, no matter how deep it is.
+
+        Args:
+            limit (int): The maximum number of records in the page.
+            cursor (str | None): The cursor returned with the previous page.
+            **kwargs (Any): The kwargs to filter by and `projection`, `cursor_columns` are
+            always loaded.
+
+        Returns:
+            tuple[list[T], str | None]: The records and the cursor of the next page, `None`
+            if this is the last page.
+
+        Raises:
+            InvalidCursor: If the cursor can not be decoded or its values do not match the
+            types of `cursor_columns`.
+        """
+        auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        projection = kwargs.pop("projection", None)
+        statement = kwargs.pop("statement", self.statement)
+        statement = self._project(statement, projection, *self.cursor_columns)
+        statement = await self._where_from_kwargs(statement, **kwargs)
+
+        columns = [getattr(self.model, name) for name in self.cursor_columns]
+        if cursor is not None:
+            values = decode_cursor(cursor, [python_type(column) for column in columns])
+            statement = statement.where(tuple_(*columns) > tuple(values))
+        statement = statement.order_by(*columns).limit(limit + 1)
+
+        async with sql_error_handler():
+            items = list((await self.session.execute(statement)).scalars())
+
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = encode_cursor(
+                    [getattr(items[-1], name) for name in self.cursor_columns]
+                )
+
+            for item in items:
+                await self._expunge(item, auto_expunge=auto_expunge)
+            return items, next_cursor
+
+    async def stream_(self, **kwargs: Any) -> AsyncIterator[T]:
+        """
+        Iterate over records from the table. Optionally filter by kwargs.
+
+        Rows are fetched from a server side cursor `yield_per` at a time, so memory use
+        does not grow with the size of the result. The session's identity map only holds
+        weak references, so streamed records that are not kept around are released.
+
+        Args:
+            **kwargs (Any): The kwargs to filter by, `projection` and `yield_per`, defaults
+            to `chunk_size`.
+
+        Yields:
+            T: The records.
+        """
+        auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
+        projection = kwargs.pop("projection", None)
+        yield_per = kwargs.pop("yield_per", self.chunk_size)
+        statement = kwargs.pop("statement", self.statement)
+        statement = self._project(statement, projection)
+        statement = await self._where_from_kwargs(statement, **kwargs)
+        statement = statement.execution_options(yield_per=yield_per)
+
+        async with sql_error_handler():
+            result = await self.session.stream_scalars(statement)
+            try:
+                async for partition in result.partitions():
+                    for item in partition:
+                        await self._expunge(item, auto_expunge=auto_expunge)
+                        yield item
+            finally:
+                await result.close()
+
     async def update(
         self,
         data: T,
@@ -311,7 +596,6 @@ class SQLAlchemyRepository(Repository[T, U]):
             await self._expunge(instance, auto_expunge=auto_expunge)
             return instance
 
-    # TODO: many at once
     async def update_many(
         self,
         data: list[T],
@@ -319,84 +603,186 @@ class SQLAlchemyRepository(Repository[T, U]):
         with_for_update: bool | None = None,
         **kwargs: Any,
     ) -> list[T]:
+        """
+        Update many records in the table using one executemany `UPDATE ... WHERE id = :id`
+        per chunk. Only changed column attributes are sent; instances that are not persisted
+        yet send every loaded column.
+
+        Args:
+            data (list[T]): The data to update the records with.
+            attribute_names (Iterable[str] | None): The attribute names to reload.
+            with_for_update (bool | None): Whether or not to use FOR UPDATE when reloading.
+            **kwargs (Any): `chunk_size` and the usual `auto_*` overrides.
+
+        Returns:
+            list[T]: The updated records, reloaded from the database if `auto_refresh`.
+
+        Raises:
+            NotFound: If any of the records does not exist.
+        """
         auto_commit = kwargs.pop("auto_commit", self.auto_commit)
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
         auto_refresh = kwargs.pop("auto_refresh", self.auto_refresh)
+        chunk_size = kwargs.pop("chunk_size", self.chunk_size)
 
         instances: list[T] = []
         async with sql_error_handler():
-            for d in data:
-                instance = await self._attach_to_session(d, strategy="merge")
-                await self._flush_or_commit(auto_commit=auto_commit)
-                await self._refresh(
-                    instance,
-                    attribute_names=attribute_names,
-                    with_for_update=with_for_update,
-                    auto_refresh=auto_refresh,
-                )
+            for chunk in chunked(data, chunk_size):
+                changes = [self._changed_column_values(d) for d in chunk]
+                params = [values for values in changes if len(values) > 1]
+                if params:
+                    try:
+                        await self.session.execute(
+                            update(self.model),
+                            params,
+                            execution_options={"autoflush": False, "synchronize_session": False},
+                        )
+                    except StaleDataError as exc:
+                        raise NotFound("No record found") from exc
+
+                for d, values in zip(chunk, changes):
+                    for key, value in values.items():
+                        set_committed_value(d, key, value)
+
+                if auto_refresh:
+                    instances.extend(
+                        await self._reload_many(
+                            chunk, attribute_names=attribute_names, with_for_update=with_for_update
+                        )
+                    )
+                else:
+                    instances.extend(chunk)
+
+            await self._flush_or_commit(auto_commit=auto_commit)
+            for instance in instances:
                 await self._expunge(instance, auto_expunge=auto_expunge)
-                instances.append(instance)
             return instances
 
     async def upsert(
         self,
         data: T,
-        attribute_names: Iterable[str] | None = None,
-        with_for_update: bool | None = None,
+        conflict_target: Iterable[str] | None = None,
+        update_columns: Iterable[str] | None = None,
         **kwargs: Any,
     ) -> T:
         """
-        Update or insert a record in the table.
+        Update or insert a record in the table with a single
+        `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` statement.
 
         Args:
             data (T): The data to update or insert the record with.
-            attribute_names (Iterable[str] | None): The attribute names to update
-            or insert the record with.
-            with_for_update (bool | None): Whether or not to use FOR UPDATE.
-            **kwargs (Any): The kwargs to filter by.
+            conflict_target (Iterable[str] | None): The attribute names of the unique index
+            to detect conflicts on, defaults to the primary key.
+            update_columns (Iterable[str] | None): The attribute names to update on conflict,
+            defaults to every provided attribute outside of `conflict_target`.
+            **kwargs (Any): The usual `auto_*` overrides.
 
         Returns:
             T: The updated or inserted record.
         """
-        auto_commit = kwargs.pop("auto_commit", self.auto_commit)
-        auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
-        auto_refresh = kwargs.pop("auto_refresh", self.auto_refresh)
-
-        async with sql_error_handler():
-            instance = await self._attach_to_session(data, strategy="merge")
-            await self._flush_or_commit(auto_commit=auto_commit)
-            await self._refresh(
-                instance,
-                attribute_names=attribute_names,
-                with_for_update=with_for_update,
-                auto_refresh=auto_refresh,
-            )
-            await self._expunge(instance, auto_expunge=auto_expunge)
-            return instance
+        instances = await self.upsert_many(
+            [data], conflict_target=conflict_target, update_columns=update_columns, **kwargs
+        )
+        if not instances:
+            raise RepositoryException("Upsert returned no record")
+        return instances[0]
 
     async def upsert_many(
         self,
         data: list[T],
-        attribute_names: Iterable[str] | None = None,
-        with_for_update: bool | None = None,
+        conflict_target: Iterable[str] | None = None,
+        update_columns: Iterable[str] | None = None,
         **kwargs: Any,
     ) -> list[T]:
+        """
+        Update or insert many records in the table, one
+        `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` statement per chunk.
+
+        Args:
+            data (list[T]): The data to update or insert the records with.
+            conflict_target (Iterable[str] | None): The attribute names of the unique index
+            to detect conflicts on, defaults to the primary key.
+            update_columns (Iterable[str] | None): The attribute names to update on conflict,
+            defaults to every provided attribute outside of `conflict_target`.
+            **kwargs (Any): `chunk_size` and the usual `auto_*` overrides.
+
+        Returns:
+            list[T]: The updated or inserted records in the order of `data`. Records of a
+            chunk with the same `conflict_target` values are upserted once, with the last
+            one's values, and returned once at the position of the first.
+        """
         auto_commit = kwargs.pop("auto_commit", self.auto_commit)
         auto_expunge = kwargs.pop("auto_expunge", self.auto_expunge)
-        auto_refresh = kwargs.pop("auto_refresh", self.auto_refresh)
+        chunk_size = kwargs.pop("chunk_size", self.chunk_size)
+
+        mapper = sqla_inspect(self.model)
+        conflict_keys = (
+            list(conflict_target)
+            if conflict_target is not None
+            else [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+        )
+        fixed_update_keys = set(update_columns) if update_columns is not None else None
 
         instances: list[T] = []
         async with sql_error_handler():
-            for d in data:
-                instance = await self._attach_to_session(d, strategy="merge")
-                await self._flush_or_commit(auto_commit=auto_commit)
-                await self._refresh(
-                    instance,
-                    attribute_names=attribute_names,
-                    with_for_update=with_for_update,
-                    auto_refresh=auto_refresh,
-                )
-                await self._expunge(instance, auto_expunge=auto_expunge)
-                instances.append(instance)
+            insert = dialect_insert(self.session.bind.dialect)
+
+            for chunk in chunked(data, chunk_size):
+                # ON CONFLICT DO UPDATE can not affect the same row twice in one statement
+                rows: dict[Any, dict[str, Any]] = {}
+                for i, d in enumerate(chunk):
+                    values = self._column_values(d)
+                    # a later duplicate replaces the values and keeps the first position
+                    rows[self._conflict_key(values, conflict_keys, default=i)] = values
+
+                # rows of one multi-row VALUES must provide the same attributes
+                groups: dict[frozenset[str], dict[Any, dict[str, Any]]] = {}
+                for row_key, values in rows.items():
+                    groups.setdefault(frozenset(values), {})[row_key] = values
+
+                results: dict[Any, T] = {}
+                for keys, group in groups.items():
+                    statement = insert(self.model).values(list(group.values()))
+                    update_keys = (
+                        fixed_update_keys
+                        if fixed_update_keys is not None
+                        else keys.difference(conflict_keys)
+                    )
+                    # `onupdate` defaults are not applied by `ON CONFLICT DO UPDATE`
+                    columns = [mapper.c[key] for key in update_keys] + [
+                        mapper.c[key]
+                        for key in mapper.c.keys()
+                        if mapper.c[key].onupdate is not None and key not in update_keys
+                    ]
+                    index_elements = [mapper.c[key] for key in conflict_keys]
+                    # with nothing to update, a no-op SET still returns the conflicting rows
+                    columns = columns or index_elements[:1]
+
+                    statement = statement.on_conflict_do_update(
+                        index_elements=index_elements,
+                        set_={c.name: statement.excluded[c.name] for c in columns},
+                    ).returning(self.model)
+                    returned = list(
+                        await self.session.scalars(
+                            statement,
+                            execution_options={"populate_existing": True, "autoflush": False},
+                        )
+                    )
+
+                    if keys.issuperset(conflict_keys):
+                        for instance in returned:
+                            values = {key: getattr(instance, key) for key in conflict_keys}
+                            results[self._conflict_key(values, conflict_keys)] = instance
+                    else:
+                        # plain INSERTs, the conflict target is filled in by defaults
+                        results.update(zip(group, returned))
 
+                try:
+                    instances.extend(results[row_key] for row_key in rows)
+                except KeyError as exc:
+                    raise RepositoryException("Upsert did not return every record") from exc
+
+            await self._flush_or_commit(auto_commit=auto_commit)
+            for instance in instances:
+                await self._expunge(instance, auto_expunge=auto_expunge)
             return instances
@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from itertools import islice
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Iterator, TypeVar
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
@@ -7,8 +8,55 @@ from chronal_api.log import get_logger
 
 from .exceptions import Conflict, RepositoryException
 
+if TYPE_CHECKING:
+    from sqlalchemy.dialects.postgresql import Insert as PostgreSQLInsert
+    from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+    from sqlalchemy.engine.interfaces import Dialect
+
 logger = get_logger()
 
+T = TypeVar("T")
+
+# SQLITE_MAX_VARIABLE_NUMBER since 3.32.0, PostgreSQL wire protocol uses an int16
+MAX_BIND_PARAMS = {"sqlite": 32766, "postgresql": 32767}
+DEFAULT_MAX_BIND_PARAMS = 999
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, found: {size!r}")
+
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def max_bind_params(dialect: "Dialect") -> int:
+    """Returns the maximum number of bind parameters in a single statement"""
+    return MAX_BIND_PARAMS.get(dialect.name, DEFAULT_MAX_BIND_PARAMS)
+
+
+def dialect_insert(dialect: "Dialect") -> Callable[..., "PostgreSQLInsert | SQLiteInsert"]:
+    """Returns the dialect specific `insert` supporting `ON CONFLICT` clauses"""
+    if dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        return insert
+    if dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        return insert
+
+    raise RepositoryException(f"ON CONFLICT is not supported for dialect: {dialect.name!r}")
+
+
+def python_type(column: Any) -> type | None:
+    """Python type of a column's values, `None` if its SQL type does not define one"""
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
 
 @asynccontextmanager
 async def sql_error_handler() -> AsyncIterator[None]:
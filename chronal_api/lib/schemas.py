@@ -1,7 +1,11 @@
+from typing import Generic, TypeVar
+
 import humps
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import ConfigDict
 
+T = TypeVar("T")
+
 
 class BaseModel(PydanticBaseModel):
     model_config = ConfigDict(
@@ -13,3 +17,8 @@ class BaseModel(PydanticBaseModel):
 
 class Message(BaseModel):
     msg: str
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
@@ -4,3 +4,7 @@ class ServiceException(Exception):
 
 class ItemNotFound(ServiceException):
     ...
+
+
+class InvalidCursor(ServiceException):
+    ...
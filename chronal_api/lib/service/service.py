@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Generic, TypeVar
 
 from chronal_api.lib.repository import exceptions as repository_exceptions
 
@@ -22,8 +22,8 @@ class Service(Generic[T, U]):
     async def create(self, data: T) -> T:
         return await self.repository.create(data)
 
-    async def create_many(self, data: list[T]) -> list[T]:
-        return await self.repository.create_many(data)
+    async def create_many(self, data: list[T], **kwargs: Any) -> list[T] | list[U]:
+        return await self.repository.create_many(data, **kwargs)
 
     async def delete(self, id: U) -> T:
         try:
@@ -31,15 +31,15 @@ class Service(Generic[T, U]):
         except repository_exceptions.NotFound as exc:
             raise service_exceptions.ItemNotFound() from exc
 
-    async def delete_many(self, ids: list[U]) -> list[T]:
-        return await self.repository.delete_many(ids)
+    async def delete_many(self, ids: list[U], **kwargs: Any) -> list[T] | int:
+        return await self.repository.delete_many(ids, **kwargs)
 
     async def exists(self, **kwargs: Any) -> bool:
         return await self.repository.exists(**kwargs)
 
-    async def get(self, id: U) -> T:
+    async def get(self, id: U, **kwargs: Any) -> T:
         try:
-            return await self.repository.get(id)
+            return await self.repository.get(id, **kwargs)
         except repository_exceptions.NotFound as exc:
             raise service_exceptions.ItemNotFound() from exc
 
@@ -58,17 +58,31 @@ class Service(Generic[T, U]):
     async def list_and_count(self, **kwargs: Any) -> tuple[list[T], int]:
         return await self.repository.list_and_count(**kwargs)
 
+    async def paginate(
+        self, limit: int, cursor: str | None = None, **kwargs: Any
+    ) -> tuple[list[T], str | None]:
+        try:
+            return await self.repository.paginate(limit, cursor, **kwargs)
+        except repository_exceptions.InvalidCursor as exc:
+            raise service_exceptions.InvalidCursor() from exc
+
+    def stream_(self, **kwargs: Any) -> AsyncIterator[T]:
+        return self.repository.stream_(**kwargs)
+
     async def update(self, data: T) -> T:
         try:
             return await self.repository.update(data)
         except repository_exceptions.NotFound as exc:
             raise service_exceptions.ItemNotFound() from exc
 
-    async def update_many(self, data: list[T]) -> list[T]:
-        return await self.repository.update_many(data)
+    async def update_many(self, data: list[T], **kwargs: Any) -> list[T]:
+        try:
+            return await self.repository.update_many(data, **kwargs)
+        except repository_exceptions.NotFound as exc:
+            raise service_exceptions.ItemNotFound() from exc
 
-    async def upsert(self, data: T) -> T:
-        return await self.repository.upsert(data)
+    async def upsert(self, data: T, **kwargs: Any) -> T:
+        return await self.repository.upsert(data, **kwargs)
 
-    async def upsert_many(self, data: list[T]) -> list[T]:
-        return await self.repository.upsert_many(data)
+    async def upsert_many(self, data: list[T], **kwargs: Any) -> list[T]:
+        return await self.repository.upsert_many(data, **kwargs)
@@ -1,18 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from chronal_api.calendars.router import router as calendars_router
+from chronal_api.lib.auth import sliding as auth_sliding
+from chronal_api.lib.auth import tasks as auth_tasks
+from chronal_api.lib.auth.hashing import password_hasher
+from chronal_api.lib.database import engine as database_engine
 from chronal_api.settings import CORSSettings, UvicornSettings, get_app_settings
 from chronal_api.users.router import router as users_router
 
 app_settings = get_app_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # the app only reports ready once the pools hold open connections
+    await database_engine.warm_up_engines()
+    sessionmaker = database_engine.get_sessionmaker()
+
+    token_purge = None
+    if app_settings.TOKEN_PURGE_INTERVAL > 0:
+        token_purge = asyncio.create_task(
+            auth_tasks.run_token_purge(
+                sessionmaker,
+                interval=app_settings.TOKEN_PURGE_INTERVAL,
+                jitter=app_settings.TOKEN_PURGE_JITTER,
+                batch_size=app_settings.TOKEN_PURGE_BATCH_SIZE,
+            )
+        )
+
+    expiry_flush = None
+    if app_settings.TOKEN_SLIDING_EXPIRY:
+        expiry_flush = asyncio.create_task(
+            auth_tasks.run_expiry_flush(
+                sessionmaker,
+                auth_sliding.expiry_extensions,
+                interval=app_settings.TOKEN_SLIDING_FLUSH_INTERVAL,
+            )
+        )
+
+    yield
+
+    for task in (token_purge, expiry_flush):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    password_hasher.shutdown()
+    await database_engine.dispose_engines()
+
+
 app = FastAPI(
     title=app_settings.TITLE,
     version=app_settings.VERSION,
     debug=app_settings.DEBUG,
     docs_url=None if app_settings.ENVIRONMENT.is_production else "/docs",
     redoc_url=None if app_settings.ENVIRONMENT.is_production else "/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(CORSMiddleware, **CORSSettings().model_dump())
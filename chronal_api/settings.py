@@ -1,7 +1,8 @@
 from enum import Enum
 from functools import lru_cache
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal
 
+from pydantic import PositiveInt, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from chronal_api import __version__
@@ -10,6 +11,9 @@ if TYPE_CHECKING:
     from sqlalchemy.engine.url import URL
 
 
+SQLiteJournalMode = Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"]
+
+
 class Environment(str, Enum):
     LOCAL = "LOCAL"
     TESTING = "TESTING"
@@ -46,6 +50,40 @@ class CORSSettings(BaseSettings):
     allow_credentials: bool = True
 
 
+class PasswordHasherSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="PASSWORD_HASHER_", case_sensitive=False)
+
+    executor: Literal["thread", "process"] = "thread"
+    workers: int = 4
+    max_pending: int = 32  # hashing jobs submitted to the executor at once
+    queue_timeout: float | None = 10.0  # seconds to wait for a free slot before giving up
+
+
+class LoginThrottleSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="LOGIN_THROTTLE_", case_sensitive=False)
+
+    enabled: bool = True
+    # token buckets, `*_burst` attempts at once then one every 1 / `*_rate` seconds
+    ip_burst: int = 30
+    ip_rate: float = 0.5
+    email_burst: int = 10
+    email_rate: float = 1 / 60
+    max_keys: int = 100000  # buckets kept per key kind, least recently used are dropped
+
+
+DATABASE_PRESETS: dict[Environment, dict[str, Any]] = {
+    # test engines are created per event loop, pooled connections would outlive them
+    Environment.TESTING: {"POOL_CLASS": "null"},
+    Environment.PRODUCTION: {
+        "POOL_SIZE": 20,
+        "MAX_OVERFLOW": 10,
+        "POOL_TIMEOUT": 10.0,
+        "POOL_RECYCLE": 1800,
+        "POOL_PRE_PING": True,
+    },
+}
+
+
 class DatabaseSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="DB_")
 
@@ -58,6 +96,49 @@ class DatabaseSettings(BaseSettings):
     DRIVER: str = ""
     ASYNC_DRIVER: str = "aiosqlite"
     ECHO: bool = False
+    # "queue" keeps up to POOL_SIZE + MAX_OVERFLOW connections open, "null" opens one per
+    # checkout and "static" shares a single one, unset is "static" for in-memory SQLite
+    # and "queue" otherwise
+    POOL_CLASS: Literal["queue", "null", "static"] | None = None
+    POOL_SIZE: int = 5
+    MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection when the pool is full
+    POOL_RECYCLE: int = -1  # seconds before a connection is replaced, -1 never
+    POOL_PRE_PING: bool = False
+    # asyncpg prepared statements cached per connection, 0 behind pgbouncer
+    STATEMENT_CACHE_SIZE: int | None = None
+    # applied to every new SQLite connection, None leaves SQLite's default
+    SQLITE_JOURNAL_MODE: SQLiteJournalMode | None = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = "NORMAL"
+    SQLITE_MMAP_SIZE: int | None = 268435456  # bytes
+    SQLITE_CACHE_SIZE: int | None = -65536  # pages, or KiB when negative
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] | None = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int | None = 5000  # milliseconds
+    # this many `query_only` connections serve read-only routes and a single connection
+    # serves all writes, unset shares one pool. Needs WAL to read while a write is open.
+    SQLITE_READERS: int | None = None
+    # connections opened before the app starts serving, unset opens POOL_SIZE of them
+    POOL_WARMUP: int | None = None
+
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        pragmas = {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+        }
+        return {name: value for name, value in pragmas.items() if value is not None}
+
+    def with_preset(self, environment: Environment) -> "DatabaseSettings":
+        """Fields not set explicitly (e.g. from `DB_*` variables) take the preset's value"""
+        preset = DATABASE_PRESETS.get(environment, {})
+        return self.model_copy(
+            update={
+                name: value for name, value in preset.items() if name not in self.model_fields_set
+            }
+        )
 
     def get_url(self, *, async_=True, **kwargs: Any) -> "URL":
         from sqlalchemy import engine
@@ -94,8 +175,45 @@ class ChronalSettings(BaseSettings):
     ROOT_PATH: str = "/"
     DEBUG: bool = True
     TOKEN_DURATION: int = 604800  # 7 days
+    TOKEN_CACHE_SIZE: int = 10000  # 0 disables the access token cache
+    TOKEN_CACHE_TTL: float = 60.0  # seconds
+    # "signed" tokens carry the user id and expiry and are verified without a lookup
+    TOKEN_FORMAT: Literal["opaque", "signed"] = "opaque"
+    # signs "signed" tokens, required with TOKEN_FORMAT="signed" and shared by all workers
+    TOKEN_SECRET_KEY: str | None = None
+    TOKEN_REVOCATION_RELOAD_INTERVAL: float = 5.0  # seconds
+    # reloads re-read revocations this many seconds older than the last one seen, as they
+    # can commit late or come from a process whose clock is behind, and every
+    # TOKEN_REVOCATION_FULL_RELOAD_INTERVAL seconds all of them are read again
+    TOKEN_REVOCATION_RELOAD_MARGIN: float = 60.0
+    TOKEN_REVOCATION_FULL_RELOAD_INTERVAL: float = 600.0
+    # expired access tokens are deleted every interval + up to jitter seconds, 0 disables
+    TOKEN_PURGE_INTERVAL: float = 3600.0
+    TOKEN_PURGE_JITTER: float = 300.0
+    TOKEN_PURGE_BATCH_SIZE: int = 1000  # rows per DELETE, each batch is its own transaction
+    # opaque tokens used with less than TOKEN_SLIDING_THRESHOLD seconds left are extended
+    # to a full TOKEN_DURATION, at most once per TOKEN_SLIDING_MIN_INTERVAL seconds each
+    TOKEN_SLIDING_EXPIRY: bool = False
+    TOKEN_SLIDING_THRESHOLD: float = 302400.0  # 3.5 days
+    TOKEN_SLIDING_MIN_INTERVAL: float = 300.0
+    # tokens remembered for TOKEN_SLIDING_MIN_INTERVAL, separate from TOKEN_CACHE_SIZE
+    TOKEN_SLIDING_MAX_TOKENS: PositiveInt = 10000
+    TOKEN_SLIDING_FLUSH_INTERVAL: float = 30.0  # seconds between bulk UPDATEs of extensions
+
+    @model_validator(mode="after")
+    def check_token_secret_key(self) -> "ChronalSettings":
+        # a random per-process key would reject tokens signed by other workers or before
+        # a restart
+        if self.TOKEN_FORMAT == "signed" and not self.TOKEN_SECRET_KEY:
+            raise ValueError('TOKEN_SECRET_KEY must be set when TOKEN_FORMAT is "signed"')
+        return self
 
 
 @lru_cache(maxsize=1)
 def get_app_settings() -> ChronalSettings:
     return ChronalSettings()
+
+
+@lru_cache(maxsize=1)
+def get_db_settings() -> DatabaseSettings:
+    return DatabaseSettings().with_preset(get_app_settings().ENVIRONMENT)
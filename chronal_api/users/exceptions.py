@@ -15,3 +15,5 @@ class HTTPError(StrEnum):
     EMAIL_ALREADY_IN_USE = "Email already in use"
     EMAIL_NOT_FOUND = "User with this email does not exist"
     WRONG_PASSWORD = "Wrong password"
+    SERVICE_BUSY = "Server is busy, try again later"
+    TOO_MANY_LOGIN_ATTEMPTS = "Too many login attempts, try again later"
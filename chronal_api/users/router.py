@@ -1,9 +1,14 @@
+import math
+
 from fastapi import HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer
+from pydantic import AwareDatetime
 
 from chronal_api.lib import schemas as api_schemas
 from chronal_api.lib.auth import dependencies as auth_dependencies
 from chronal_api.lib.auth import exceptions as auth_exceptions
+from chronal_api.lib.auth import throttling as auth_throttling
+from chronal_api.lib.database import dependencies as db_dependencies
 from chronal_api.lib.router import APIRouter
 
 from . import dependencies, exceptions, schemas
@@ -25,6 +30,13 @@ router = APIRouter(
                     }
                 },
             },
+            status.HTTP_503_SERVICE_UNAVAILABLE: {
+                "description": "Too many password hashing requests at once",
+                "model": api_schemas.Message,
+                "content": {
+                    "application/json": {"example": {"msg": exceptions.HTTPError.SERVICE_BUSY}}
+                },
+            },
         },
         "users:token": {
             status.HTTP_201_CREATED: {
@@ -51,10 +63,34 @@ router = APIRouter(
                     "application/json": {"example": {"msg": exceptions.HTTPError.EMAIL_NOT_FOUND}}
                 },
             },
+            status.HTTP_429_TOO_MANY_REQUESTS: {
+                "description": "Too many login attempts from this address or for this email",
+                "model": api_schemas.Message,
+                "content": {
+                    "application/json": {
+                        "example": {"msg": exceptions.HTTPError.TOO_MANY_LOGIN_ATTEMPTS}
+                    }
+                },
+            },
+            status.HTTP_503_SERVICE_UNAVAILABLE: {
+                "description": "Too many password hashing requests at once",
+                "model": api_schemas.Message,
+                "content": {
+                    "application/json": {"example": {"msg": exceptions.HTTPError.SERVICE_BUSY}}
+                },
+            },
         },
         "users:logout": {
             status.HTTP_204_NO_CONTENT: {"description": "User successfully logged out"}
         },
+        "users:logout_all": {
+            status.HTTP_204_NO_CONTENT: {"description": "All tokens of the user revoked"},
+            status.HTTP_401_UNAUTHORIZED: {
+                "description": "Unauthorized",
+                "model": api_schemas.Message,
+                "content": {"application/json": {"example": {"msg": "Unauthorized"}}},
+            },
+        },
     },
 )
 
@@ -76,6 +112,11 @@ async def register(
             status_code=status.HTTP_409_CONFLICT,
             detail={"msg": exceptions.HTTPError.EMAIL_ALREADY_IN_USE},
         )
+    except auth_exceptions.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"msg": exceptions.HTTPError.SERVICE_BUSY},
+        )
     else:
         return user
 
@@ -86,12 +127,20 @@ async def register(
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.AccessToken,
 )
+@db_dependencies.read_only
 async def create_token(
+    request: Request,
     data: schemas.CreateToken,
     user_service: dependencies.UserService,
-    auth_service: auth_dependencies.AuthService,
+    auth_service: auth_dependencies.WriteAuthService,
 ):
+    # the lookup and the password check run on a read session, only the token INSERT
+    # takes the writer
     try:
+        # before any query or hashing, sessions do not connect until they are used
+        auth_throttling.login_throttle.check(
+            request.client.host if request.client else None, data.email
+        )
         user = await user_service.get_by_email(data.email)
         await auth_service.authenticate(user, data.password)
     except exceptions.UserNotFound:
@@ -104,6 +153,17 @@ async def create_token(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"msg": exceptions.HTTPError.WRONG_PASSWORD},
         )
+    except auth_exceptions.TooManyLoginAttempts as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"msg": exceptions.HTTPError.TOO_MANY_LOGIN_ATTEMPTS},
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+    except auth_exceptions.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"msg": exceptions.HTTPError.SERVICE_BUSY},
+        )
     else:
         token = await auth_service.create_token(user)
         return {"access_token": token.access_token, "token_type": "bearer"}
@@ -115,6 +175,7 @@ async def create_token(
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
 )
+@db_dependencies.read_write
 async def logout(
     request: Request,
     user: auth_dependencies.OptionalCurrentUser,
@@ -125,3 +186,17 @@ async def logout(
         security = await bearer(request)
         if security:
             await auth_service.delete_token(security.credentials)
+
+
+@router.post(
+    "/logout/all",
+    name="users:logout_all",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def logout_all(
+    user: auth_dependencies.CurrentUser,
+    auth_service: auth_dependencies.AuthService,
+    before: AwareDatetime | None = None,
+):
+    await auth_service.delete_user_tokens(user.id, created_before=before)
@@ -1,6 +1,7 @@
 from uuid import UUID
 
-from chronal_api.lib.auth import security as auth_security
+from chronal_api.lib.auth import hashing as auth_hashing
+from chronal_api.lib.repository import exceptions as repository_exceptions
 from chronal_api.lib.service import Service
 
 from . import exceptions, models, repository, schemas
@@ -12,13 +13,13 @@ class UserService(Service[models.User, UUID]):
         self.repository = repository
 
     async def create_user(self, data: schemas.UserCreate) -> models.User:
-        hashed_password = auth_security.get_password_hash(data.password)
+        hashed_password = await auth_hashing.hash_password(data.password)
 
-        email_exists = await self.repository.email_exists(data.email)
-        if email_exists:
-            raise exceptions.EmailAlreadyExists()
-
-        return await self.repository.create_user(data.email, hashed_password)
+        # the unique email index rejects duplicates, no need to look them up first
+        try:
+            return await self.repository.create_user(data.email, hashed_password)
+        except repository_exceptions.Conflict as exc:
+            raise exceptions.EmailAlreadyExists() from exc
 
     async def get_by_email(self, email: str) -> models.User:
         user = await self.repository.get_by_email(email)
@@ -0,0 +1,63 @@
+"""Hash access token keys
+
+Revision ID: 7c4e0a9d2f16
+Revises: 2d71f4b9a0c3
+Create Date: 2026-10-18 21:07:55.902184
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e0a9d2f16"
+down_revision: Union[str, None] = "2d71f4b9a0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column("access_tokens", sa.Column("token_hash", sa.LargeBinary(length=32)))
+
+    # existing bearer tokens keep working, their keys become SHA-256 digests
+    access_tokens = sa.table(
+        "access_tokens",
+        sa.column("access_token", sa.String),
+        sa.column("token_hash", sa.LargeBinary),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(access_tokens.c.access_token)).scalars()
+    update = (
+        access_tokens.update()
+        .where(access_tokens.c.access_token == sa.bindparam("b_access_token"))
+        .values(token_hash=sa.bindparam("b_token_hash"))
+    )
+    while batch := rows.fetchmany(BATCH_SIZE):
+        connection.execute(
+            update,
+            [
+                {"b_access_token": token, "b_token_hash": hashlib.sha256(token.encode()).digest()}
+                for token in batch
+            ],
+        )
+
+    with op.batch_alter_table("access_tokens", recreate="auto") as batch_op:
+        batch_op.drop_constraint("access_tokens_pkey", type_="primary")
+        batch_op.alter_column("token_hash", existing_type=sa.LargeBinary(32), nullable=False)
+        batch_op.create_primary_key("access_tokens_pkey", ["token_hash"])
+        batch_op.drop_column("access_token")
+
+
+def downgrade() -> None:
+    # bearer tokens can not be recovered from their hashes, everyone has to log in again
+    op.execute("DELETE FROM access_tokens")
+
+    with op.batch_alter_table("access_tokens", recreate="auto") as batch_op:
+        batch_op.drop_constraint("access_tokens_pkey", type_="primary")
+        batch_op.add_column(sa.Column("access_token", sa.String(length=1024), nullable=False))
+        batch_op.create_primary_key("access_tokens_pkey", ["access_token"])
+        batch_op.drop_column("token_hash")
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from chronal_api.lib.auth import models as auth_models
+from chronal_api.lib.auth import sliding as auth_sliding
+from chronal_api.lib.auth import tasks as auth_tasks
+from tests import factories
+
+
+async def test_purge_expired_tokens(
+    session: AsyncSession,
+    access_token_factory: factories.AccessTokenFactory,
+    user_factory: factories.UserFactory,
+):
+    user = await user_factory.create()
+    expired = datetime.now(tz=timezone.utc) - timedelta(seconds=1)
+    await access_token_factory.create_batch(5, user=user, expiration_date=expired)
+    active = await access_token_factory.create(user=user)
+
+    deleted = await auth_tasks.purge_expired_tokens(
+        async_sessionmaker(session.bind, expire_on_commit=False), batch_size=2
+    )
+
+    assert deleted == 5
+    tokens = (
+        await session.execute(
+            select(func.count()).where(auth_models.AccessToken.user_id == user.id)
+        )
+    ).scalar_one()
+    assert tokens == 1
+    assert await session.get(auth_models.AccessToken, active.token_hash) is not None
+
+
+async def test_flush_expiry_extensions(
+    session: AsyncSession,
+    access_token_factory: factories.AccessTokenFactory,
+    user_factory: factories.UserFactory,
+):
+    user = await user_factory.create()
+    expiring = await access_token_factory.create(
+        user=user, expiration_date=datetime.now(tz=timezone.utc) + timedelta(seconds=60)
+    )
+    extended = await access_token_factory.create(
+        user=user, expiration_date=datetime.now(tz=timezone.utc) + timedelta(days=30)
+    )
+    extensions = auth_sliding.ExpiryExtensions(
+        duration=3600, threshold=31 * 86400, min_interval=60, maxsize=10
+    )
+    new_expiration_date = extensions.extend(expiring.access_token, expiring.expiration_date)
+    # pending extensions never shorten a token
+    extensions.extend(extended.access_token, extended.expiration_date)
+
+    flushed = await auth_tasks.flush_expiry_extensions(
+        async_sessionmaker(session.bind, expire_on_commit=False), extensions
+    )
+
+    assert flushed == 2
+    expiration_dates = dict(
+        (
+            await session.execute(
+                select(
+                    auth_models.AccessToken.token_hash, auth_models.AccessToken.expiration_date
+                ).where(auth_models.AccessToken.user_id == user.id)
+            )
+        ).all()
+    )
+    assert expiration_dates[expiring.token_hash] == new_expiration_date
+    assert expiration_dates[extended.token_hash] == extended.expiration_date
@@ -1,12 +1,15 @@
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import httpx
+import pytest
 from faker import Faker
 from fastapi import status
 
 from chronal_api.calendars import exceptions as calendars_exceptions
 from chronal_api.calendars import schemas as calendars_schemas
 from chronal_api.lib.auth import models as auth_models
+from chronal_api.lib.repository.pagination import encode_cursor
 from tests import factories
 
 fake = Faker()
@@ -23,8 +26,54 @@ async def test_list_users_calendars(
     assert response.status_code == status.HTTP_200_OK
 
     response_json = response.json()
-    assert len(response_json) == len(calendars)
-    assert all(calendar["id"] in [str(cal.id) for cal in calendars] for calendar in response_json)
+    assert len(response_json["items"]) == len(calendars)
+    assert all(
+        calendar["id"] in [str(cal.id) for cal in calendars] for calendar in response_json["items"]
+    )
+    assert response_json["nextCursor"] is None
+
+
+async def test_list_users_calendars_paginated(
+    calendar_factory: factories.CalendarFactory,
+    authorized_client: tuple[httpx.AsyncClient, auth_models.AccessToken],
+):
+    client, token = authorized_client
+    calendars = await calendar_factory.create_batch(7, owner=token.user)
+
+    ids: list[str] = []
+    params: dict[str, str | int] = {"limit": 3}
+    for _ in range(3):
+        response = await client.get("/calendars", params=params)
+        assert response.status_code == status.HTTP_200_OK
+
+        response_json = response.json()
+        ids.extend(calendar["id"] for calendar in response_json["items"])
+        if response_json["nextCursor"] is None:
+            break
+        params["cursor"] = response_json["nextCursor"]
+
+    assert response_json["nextCursor"] is None
+    assert sorted(ids) == sorted(str(cal.id) for cal in calendars)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor([1, 2]),
+        encode_cursor([datetime(2023, 10, 8, 12, 30), uuid4()]),
+        encode_cursor([datetime(2023, 10, 8, 12, 30, tzinfo=timezone.utc), str(uuid4())]),
+        encode_cursor([uuid4()]),
+    ],
+)
+async def test_list_users_calendars_invalid_cursor_400(
+    authorized_client: tuple[httpx.AsyncClient, auth_models.AccessToken], cursor: str
+):
+    client, _ = authorized_client
+    response = await client.get("/calendars", params={"cursor": cursor})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"]["msg"] == calendars_exceptions.HTTPError.INVALID_CURSOR
 
 
 async def test_list_users_calendars_unauthorized_401(client: httpx.AsyncClient):
@@ -39,7 +88,7 @@ async def test_list_users_calendars_empty(
     response = await client.get("/calendars")
     assert response.status_code == status.HTTP_200_OK
 
-    assert response.json() == []
+    assert response.json() == {"items": [], "nextCursor": None}
 
 
 async def test_get_by_id(
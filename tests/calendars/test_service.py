@@ -1,3 +1,5 @@
+from uuid import uuid4
+
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,6 +8,7 @@ from chronal_api.calendars import exceptions as calendars_exceptions
 from chronal_api.calendars import models as calendars_models
 from chronal_api.calendars import schemas as calendars_schemas
 from chronal_api.calendars import service as calendars_service
+from chronal_api.lib.service import exceptions as service_exceptions
 from tests import factories
 
 
@@ -22,6 +25,39 @@ async def test_user_is_calendar_owner(
     assert await calendar_service.is_calendar_owner(user.id, calendar_2.id) is False
 
 
+async def test_get_user_calendar(
+    calendar_service: calendars_service.CalendarService,
+    calendar_factory: factories.CalendarFactory,
+    user_factory: factories.UserFactory,
+):
+    user = await user_factory.create()
+    calendar = await calendar_factory.create(owner=user)
+
+    assert await calendar_service.get_user_calendar(user.id, calendar.id) == calendar
+
+
+async def test_get_user_calendar_raises_item_not_found(
+    calendar_service: calendars_service.CalendarService,
+    user_factory: factories.UserFactory,
+):
+    user = await user_factory.create()
+
+    with pytest.raises(service_exceptions.ItemNotFound):
+        await calendar_service.get_user_calendar(user.id, uuid4())
+
+
+async def test_get_user_calendar_raises_not_calendar_owner(
+    calendar_service: calendars_service.CalendarService,
+    calendar_factory: factories.CalendarFactory,
+    user_factory: factories.UserFactory,
+):
+    user = await user_factory.create()
+    calendar = await calendar_factory.create()
+
+    with pytest.raises(calendars_exceptions.NotCalendarOwner):
+        await calendar_service.get_user_calendar(user.id, calendar.id)
+
+
 async def test_create_calendar(
     session: AsyncSession,
     calendar_service: calendars_service.CalendarService,
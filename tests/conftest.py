@@ -58,6 +58,7 @@ async def client(session) -> AsyncIterator[httpx.AsyncClient]:
     assert app_settings.ENVIRONMENT == "TESTING"
 
     app.dependency_overrides[database_dependencies.db_session] = lambda: session
+    app.dependency_overrides[database_dependencies.db_write_session] = lambda: session
 
     async with httpx.AsyncClient(
         app=app,
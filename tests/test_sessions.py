@@ -0,0 +1,88 @@
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+from fastapi import Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from chronal_api.lib.auth import models as auth_models
+from chronal_api.lib.database import dependencies as database_dependencies
+from chronal_api.main import app
+from chronal_api.users import schemas as users_schemas
+from tests import factories
+
+SESSION_METHODS = {"add", "add_all", "delete", "execute", "flush", "get", "scalar", "scalars"}
+
+
+class SessionSpy:
+    """Records which session methods a route calls, everything else goes to `session`"""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self.calls: list[str] = []
+
+    def __getattr__(self, name: str) -> Any:
+        if name in SESSION_METHODS:
+            self.calls.append(name)
+        return getattr(self._session, name)
+
+
+@pytest.fixture
+def sessions(client: httpx.AsyncClient, session: AsyncSession) -> dict[str, SessionSpy]:
+    spies = {kind: SessionSpy(session) for kind in ("read", "write", "write_session")}
+
+    async def db_session(request: Request) -> AsyncIterator[SessionSpy]:
+        yield spies["read" if database_dependencies.is_read_only(request) else "write"]
+
+    async def db_write_session() -> AsyncIterator[SessionSpy]:
+        yield spies["write_session"]
+
+    app.dependency_overrides[database_dependencies.db_session] = db_session
+    app.dependency_overrides[database_dependencies.db_write_session] = db_write_session
+    return spies
+
+
+async def test_get_route_uses_read_session(
+    authorized_client: tuple[httpx.AsyncClient, auth_models.AccessToken],
+    sessions: dict[str, SessionSpy],
+):
+    client, _ = authorized_client
+
+    response = await client.get("/calendars")
+    assert response.status_code == status.HTTP_200_OK
+
+    assert sessions["read"].calls
+    assert not sessions["write"].calls
+    assert not sessions["write_session"].calls
+
+
+async def test_post_route_uses_write_session(
+    authorized_client: tuple[httpx.AsyncClient, auth_models.AccessToken],
+    sessions: dict[str, SessionSpy],
+):
+    client, _ = authorized_client
+
+    response = await client.post("/calendars", json={"title": "Calendar"})
+    assert response.status_code == status.HTTP_201_CREATED
+
+    assert "add" in sessions["write"].calls
+    assert not sessions["read"].calls
+
+
+async def test_token_verifies_on_read_session_and_inserts_on_writer(
+    client: httpx.AsyncClient,
+    user_factory: factories.UserFactory,
+    sessions: dict[str, SessionSpy],
+):
+    user = await user_factory.create()
+    data = users_schemas.CreateToken(
+        email=user.email, password=factories.UserFactory._DEFAULT_PASSWORD
+    )
+
+    response = await client.post("/users/token", json=data.model_dump())
+    assert response.status_code == status.HTTP_201_CREATED
+
+    assert sessions["read"].calls
+    assert "add" not in sessions["read"].calls
+    assert "add" in sessions["write_session"].calls
+    assert not sessions["write"].calls
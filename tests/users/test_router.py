@@ -1,11 +1,17 @@
 import uuid
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
+from unittest import mock
 
+import pytest
 from faker import Faker
 from fastapi import status
 from sqlalchemy import select
 
 from chronal_api.lib.auth import models as auth_models
+from chronal_api.lib.auth import security as auth_security
+from chronal_api.lib.auth import throttling as auth_throttling
+from chronal_api.settings import LoginThrottleSettings
 from chronal_api.users import exceptions as users_exceptions
 from chronal_api.users import schemas as users_schemas
 from tests import factories
@@ -83,6 +89,27 @@ async def test_token_400_wrong_password(
     assert response_json["detail"]["msg"] == users_exceptions.HTTPError.WRONG_PASSWORD
 
 
+async def test_token_429_too_many_login_attempts(
+    client: "httpx.AsyncClient", monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(
+        auth_throttling,
+        "login_throttle",
+        auth_throttling.LoginThrottle(LoginThrottleSettings(email_burst=1, email_rate=0.01)),
+    )
+    data = users_schemas.CreateToken(email="abc@abc.com", password="password")
+
+    response = await client.post("/users/token", json=data.model_dump())
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    with mock.patch.object(auth_security, "verify_password") as mock_verify_password:
+        response = await client.post("/users/token", json=data.model_dump())
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "100"
+    assert response.json()["detail"]["msg"] == users_exceptions.HTTPError.TOO_MANY_LOGIN_ATTEMPTS
+    mock_verify_password.assert_not_called()
+
+
 async def test_logout(
     authorized_client: tuple["httpx.AsyncClient", auth_models.AccessToken],
     session: "AsyncSession",
@@ -95,13 +122,130 @@ async def test_logout(
     token_in_db = (
         await session.execute(
             select(auth_models.AccessToken).where(
-                auth_models.AccessToken.access_token == token.access_token
+                auth_models.AccessToken.token_hash == token.token_hash
             )
         )
     ).scalar_one_or_none()
     assert token_in_db is None
 
 
+async def test_logout_token_no_longer_valid(
+    authorized_client: tuple["httpx.AsyncClient", auth_models.AccessToken],
+):
+    client, _ = authorized_client
+
+    assert (await client.get("/calendars")).status_code == status.HTTP_200_OK
+    assert (await client.get("/calendars")).status_code == status.HTTP_200_OK
+
+    response = await client.get("/users/logout")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get("/calendars")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_signed_token_logout(
+    client: "httpx.AsyncClient",
+    user_factory: factories.UserFactory,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(auth_security.settings, "TOKEN_FORMAT", "signed")
+    user = await user_factory.create()
+    data = users_schemas.CreateToken(
+        email=user.email, password=factories.UserFactory._DEFAULT_PASSWORD
+    )
+
+    response = await client.post("/users/token", json=data.model_dump())
+    assert response.status_code == status.HTTP_201_CREATED
+    access_token = response.json()["accessToken"]
+    assert auth_security.is_signed_token(access_token)
+
+    client.headers.update({"Authorization": f"Bearer {access_token}"})
+    assert (await client.get("/calendars")).status_code == status.HTTP_200_OK
+
+    response = await client.get("/users/logout")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get("/calendars")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 async def test_logout_204_not_authenticated(client: "httpx.AsyncClient"):
     response = await client.get("/users/logout")
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+async def test_logout_all(
+    authorized_client: tuple["httpx.AsyncClient", auth_models.AccessToken],
+    access_token_factory: factories.AccessTokenFactory,
+    session: "AsyncSession",
+):
+    client, token = authorized_client
+    await access_token_factory.create_batch(2, user=token.user)
+    assert (await client.get("/calendars")).status_code == status.HTTP_200_OK
+
+    response = await client.post("/users/logout/all")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    revoked_at = (
+        await session.scalars(
+            select(auth_models.AccessToken.revoked_at).where(
+                auth_models.AccessToken.user_id == token.user_id
+            )
+        )
+    ).all()
+    assert len(revoked_at) == 3
+    assert all(revoked_at)
+    response = await client.get("/calendars")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_logout_all_before(
+    authorized_client: tuple["httpx.AsyncClient", auth_models.AccessToken],
+    access_token_factory: factories.AccessTokenFactory,
+):
+    client, token = authorized_client
+    old_token = await access_token_factory.create(
+        user=token.user, created_at=datetime.now(tz=timezone.utc) - timedelta(days=1)
+    )
+
+    response = await client.post(
+        "/users/logout/all",
+        params={"before": (datetime.now(tz=timezone.utc) - timedelta(hours=1)).isoformat()},
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert (await client.get("/calendars")).status_code == status.HTTP_200_OK
+    client.headers.update({"Authorization": f"Bearer {old_token.access_token}"})
+    response = await client.get("/calendars")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_logout_all_signed(
+    client: "httpx.AsyncClient",
+    user_factory: factories.UserFactory,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(auth_security.settings, "TOKEN_FORMAT", "signed")
+    user = await user_factory.create()
+    data = users_schemas.CreateToken(
+        email=user.email, password=factories.UserFactory._DEFAULT_PASSWORD
+    )
+    tokens = [
+        (await client.post("/users/token", json=data.model_dump())).json()["accessToken"]
+        for _ in range(2)
+    ]
+
+    client.headers.update({"Authorization": f"Bearer {tokens[0]}"})
+    response = await client.post("/users/logout/all")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for access_token in tokens:
+        client.headers.update({"Authorization": f"Bearer {access_token}"})
+        response = await client.get("/calendars")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_logout_all_401_not_authenticated(client: "httpx.AsyncClient"):
+    response = await client.post("/users/logout/all")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
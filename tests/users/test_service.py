@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 
+from chronal_api.lib.repository import exceptions as repository_exceptions
 from chronal_api.users import exceptions as users_exceptions
 from chronal_api.users import schemas as users_schemas
 from chronal_api.users import service as users_service
@@ -24,14 +25,13 @@ async def test_create_user(
     mock_get_password_hash: mock.MagicMock, user_service: users_service.UserService
 ):
     mock_get_password_hash.return_value = "password"
-    user_service.repository.email_exists.return_value = False
     user_service.repository.create_user.return_value = mock.Mock()
     schema = users_schemas.UserCreate(email="example@example.com", password="passw0rd123!@#")
 
     r = await user_service.create_user(schema)
 
     mock_get_password_hash.assert_called_once_with(schema.password)
-    user_service.repository.email_exists.assert_called_once_with(schema.email)
+    user_service.repository.email_exists.assert_not_called()
     user_service.repository.create_user.assert_called_once_with(
         schema.email, mock_get_password_hash.return_value
     )
@@ -43,7 +43,7 @@ async def test_create_user_raises_email_already_exists(
     mock_get_password_hash: mock.MagicMock, user_service: users_service.UserService
 ):
     mock_get_password_hash.return_value = "password"
-    user_service.repository.email_exists.return_value = True
+    user_service.repository.create_user.side_effect = repository_exceptions.Conflict()
     schema = users_schemas.UserCreate(email="example@example.com", password="passw0rd123!@#")
 
     with pytest.raises(users_exceptions.EmailAlreadyExists):
@@ -1,16 +1,22 @@
+from typing import AsyncIterator
+
 import pytest
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy import event, select
+from sqlalchemy import inspect as sqla_inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from chronal_api.lib.repository import exceptions as repo_exceptions
 from chronal_api.lib.repository.sqlalchemy import SQLAlchemyRepository
 
-from ..conftest import DUMMY_COUNT
+from ..conftest import DUMMY_COUNT, db_settings
 from ..models import TodoItem
 
 
 class TodoItemRepository(SQLAlchemyRepository[TodoItem, int]):
     model = TodoItem
+    cursor_columns = ("id",)
 
 
 @pytest.fixture(scope="function")
@@ -18,6 +24,15 @@ async def repo(session) -> SQLAlchemyRepository[TodoItem, int]:
     return TodoItemRepository(session)
 
 
+@pytest.fixture(scope="function")
+async def stream_session() -> AsyncIterator[AsyncSession]:
+    """`stream_` needs server side cursors, which the raw `pysqlite3` module does not have"""
+    engine = create_async_engine(db_settings.get_url().render_as_string())
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
 async def test_count(insert_dummy, repo: TodoItemRepository):
     repo_count = await repo.count()
     assert repo_count == DUMMY_COUNT
@@ -81,6 +96,42 @@ async def test_create_many(session: AsyncSession, repo: TodoItemRepository):
     assert all((item.id in [i.id for i in items_from_db] for item in items))
 
 
+async def test_create_many_auto_expunge(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test create_many {i}", description="d", is_completed=False)
+        for i in range(3)
+    ]
+
+    await repo.create_many(items, auto_expunge=True)
+    assert all(item not in session for item in items)
+
+
+async def test_create_many_bulk(session: AsyncSession, repo: TodoItemRepository):
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    items = (
+        TodoItem(title=f"Test create_many {i}", description=f"{i}", is_completed=False)
+        if i % 2
+        else {"title": f"Test create_many {i}", "description": f"{i}", "is_completed": False}
+        for i in range(10)
+    )
+    ids = await repo.create_many(items, bulk=True, chunk_size=4)
+    assert len(ids) == 10
+    assert len([s for s in statements if s.startswith("INSERT")]) == 3
+    assert not session.new
+
+    items_from_db = (
+        await session.execute(select(TodoItem.id, TodoItem.description).order_by(TodoItem.id))
+    ).all()
+    assert sorted(row.id for row in items_from_db) == sorted(ids)
+    assert [row.description for row in items_from_db] == [f"{i}" for i in range(10)]
+
+
 async def test_delete(session: AsyncSession, repo: TodoItemRepository):
     item = TodoItem(
         title="Test delete",
@@ -131,6 +182,39 @@ async def test_delete_many(session: AsyncSession, repo: TodoItemRepository):
     assert items_from_db == []
 
 
+async def test_delete_many_chunked(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test delete_many {i}", description="d", is_completed=False)
+        for i in range(10)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    deleted = await repo.delete_many([item.id for item in items], chunk_size=4)
+    assert len(deleted) == len(items)
+    assert len([s for s in statements if s.startswith("DELETE")]) == 3
+
+
+async def test_delete_many_without_rows(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test delete_many {i}", description="d", is_completed=False)
+        for i in range(10)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    deleted = await repo.delete_many([item.id for item in items] + [999999], return_rows=False)
+    assert deleted == len(items)
+    assert await repo.count() == 0
+
+
 async def test_exists(session: AsyncSession, repo: TodoItemRepository):
     item = TodoItem(
         title="Test exists",
@@ -145,6 +229,20 @@ async def test_exists(session: AsyncSession, repo: TodoItemRepository):
     assert (await repo.exists(description=item.description)) is True
 
 
+async def test_exists_uses_exists_subquery(session: AsyncSession, repo: TodoItemRepository):
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    await repo.exists(title="Test exists")
+    assert len(statements) == 1
+    assert statements[0].startswith("SELECT EXISTS (SELECT 1")
+    assert "count" not in statements[0].lower()
+
+
 async def test_exists_false(repo: TodoItemRepository):
     assert (await repo.exists(id=999999)) is False
     assert (await repo.exists(title="Test exists")) is False
@@ -224,6 +322,106 @@ async def test_list_(session: AsyncSession, repo: TodoItemRepository):
     assert all((item.title in [i.title for i in items_from_db] for item in items))
 
 
+async def test_stream_(stream_session: AsyncSession):
+    items = [
+        TodoItem(title=f"Test stream {i}", description="test stream", is_completed=False)
+        for i in range(25)
+    ]
+    stream_session.add_all(items)
+    await stream_session.commit()
+
+    statements: list[str] = []
+    event.listen(
+        stream_session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    stream = TodoItemRepository(stream_session).stream_(description="test stream", yield_per=10)
+    streamed = [item async for item in stream]
+
+    assert sorted(item.id for item in streamed) == sorted(item.id for item in items)
+    assert len(statements) == 1
+
+
+async def test_stream_auto_expunge(stream_session: AsyncSession):
+    items = [
+        TodoItem(title=f"Test stream {i}", description="test stream", is_completed=False)
+        for i in range(5)
+    ]
+    stream_session.add_all(items)
+    await stream_session.commit()
+    stream_session.expunge_all()
+
+    streamed = [
+        item
+        async for item in TodoItemRepository(stream_session).stream_(
+            description="test stream", auto_expunge=True
+        )
+    ]
+
+    assert len(streamed) == len(items)
+    assert all(item not in stream_session for item in streamed)
+
+
+class TodoItemTitle(BaseModel):
+    id: int
+    title: str
+    subtasks: list[str] = []
+
+
+async def test_list_projection(session: AsyncSession, repo: TodoItemRepository):
+    session.add_all(
+        [
+            TodoItem(
+                title=f"Test projection {i}", description="test projection", is_completed=False
+            )
+            for i in range(5)
+        ]
+    )
+    await session.commit()
+    session.expunge_all()
+
+    items = await repo.list_(description="test projection", projection=["title"])
+
+    assert len(items) == 5
+    assert all(sqla_inspect(item).unloaded == {"description", "is_completed"} for item in items)
+    with pytest.raises(InvalidRequestError):
+        items[0].description
+
+
+async def test_get_projection_schema(session: AsyncSession, repo: TodoItemRepository):
+    item = TodoItem(title="Test projection", description="test projection", is_completed=False)
+    session.add(item)
+    await session.commit()
+    session.expunge_all()
+
+    item_from_db = await repo.get(item.id, projection=TodoItemTitle)
+
+    assert item_from_db.title == item.title
+    assert sqla_inspect(item_from_db).unloaded == {"description", "is_completed"}
+
+
+async def test_paginate_projection_loads_cursor_columns(
+    session: AsyncSession, repo: TodoItemRepository
+):
+    session.add_all([TodoItem(title=f"{i}", description="", is_completed=False) for i in range(3)])
+    await session.commit()
+    session.expunge_all()
+
+    repo.cursor_columns = ("title", "id")
+    items, next_cursor = await repo.paginate(2, projection=["description"])
+
+    assert len(items) == 2
+    assert next_cursor is not None
+    assert sqla_inspect(items[0]).unloaded == {"is_completed"}
+
+
+async def test_projection_unknown_column(repo: TodoItemRepository):
+    with pytest.raises(repo_exceptions.RepositoryException):
+        await repo.list_(projection=["title", "not_a_column"])
+
+
 async def test_list_and_count(session: AsyncSession, repo: TodoItemRepository):
     items = [
         TodoItem(
@@ -243,6 +441,72 @@ async def test_list_and_count(session: AsyncSession, repo: TodoItemRepository):
     assert count == len(items)
 
 
+@pytest.mark.parametrize(
+    ("count_strategy", "statement_count"), [("separate", 2), ("window", 1), ("subquery", 1)]
+)
+async def test_list_and_count_limit_offset(
+    session: AsyncSession, repo: TodoItemRepository, count_strategy: str, statement_count: int
+):
+    items = [
+        TodoItem(title=f"Test list {i}", description="test list", is_completed=False)
+        for i in range(25)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    page, count = await repo.list_and_count(
+        description="test list", limit=10, offset=20, count_strategy=count_strategy
+    )
+    assert len(page) == 5
+    assert count == len(items)
+    assert len(statements) == statement_count
+
+    page, count = await repo.list_and_count(
+        description="test list", limit=10, offset=30, count_strategy=count_strategy
+    )
+    assert page == []
+    assert count == len(items)
+
+
+async def test_list_and_count_raises_repository_exception_on_wrong_count_strategy(
+    repo: TodoItemRepository,
+):
+    with pytest.raises(repo_exceptions.RepositoryException, match="Count strategy must be"):
+        await repo.list_and_count(count_strategy="wrong")
+
+
+async def test_paginate(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test paginate {i}", description="test paginate", is_completed=False)
+        for i in range(25)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    pages: list[list[TodoItem]] = []
+    cursor = None
+    while True:
+        page, cursor = await repo.paginate(10, cursor, description="test paginate")
+        pages.append(page)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [item.id for page in pages for item in page] == [item.id for item in items]
+
+
+async def test_paginate_raises_invalid_cursor(repo: TodoItemRepository):
+    with pytest.raises(repo_exceptions.InvalidCursor):
+        await repo.paginate(10, "invalid")
+
+
 async def test_update(session: AsyncSession, repo: TodoItemRepository):
     item = TodoItem(title="Test update", description="test update desc", is_completed=False)
     session.add(item)
@@ -290,6 +554,61 @@ async def test_update_many(session: AsyncSession, repo: TodoItemRepository):
     assert all((item.title in [i.title for i in items_from_db] for item in items))
 
 
+async def test_update_many_chunked(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test update {i}", description="test update desc", is_completed=False)
+        for i in range(10)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    for item in items:
+        item.is_completed = True
+
+    updated = await repo.update_many(items, chunk_size=3)
+    assert [item.id for item in updated] == [item.id for item in items]
+    assert all(item.is_completed for item in updated)
+    assert not session.dirty
+
+    items_from_db = (
+        (await session.execute(select(TodoItem).where(TodoItem.is_completed.is_(True))))
+        .scalars()
+        .all()
+    )
+    assert len(items_from_db) == len(items)
+
+
+async def test_update_many_without_refresh(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test update {i}", description="test update desc", is_completed=False)
+        for i in range(5)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    for item in items:
+        item.description = "test update desc updated"
+
+    updated = await repo.update_many(items, auto_refresh=False)
+    assert updated == items
+    assert not session.dirty
+
+    count = await repo.count(description="test update desc updated")
+    assert count == len(items)
+
+
+async def test_update_many_raises_not_found(session: AsyncSession, repo: TodoItemRepository):
+    item = TodoItem(title="Test update", description="test update desc", is_completed=False)
+    session.add(item)
+    await session.commit()
+
+    item.title = "Test update updated"
+    with pytest.raises(repo_exceptions.NotFound):
+        await repo.update_many(
+            [item, TodoItem(id=123123123, title="title", description="d", is_completed=False)]
+        )
+
+
 async def test_upsert_create(session: AsyncSession, repo: TodoItemRepository):
     item = TodoItem(title="Test upsert", description="test upsert desc", is_completed=False)
     upserted = await repo.upsert(item)
@@ -361,3 +680,88 @@ async def test_upsert_many_update(session: AsyncSession, repo: TodoItemRepositor
     )
     assert len(items_from_db) == len(items)
     assert all((item.title == "Test upsert updated" for item in items_from_db))
+
+
+async def test_upsert_many_chunked(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Test upsert {i}", description="test upsert desc", is_completed=False)
+        for i in range(10)
+    ]
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    upserted = await repo.upsert_many(items, chunk_size=3)
+    assert len(upserted) == len(items)
+    assert len([s for s in statements if s.startswith("INSERT")]) == 4
+    assert all("ON CONFLICT" in s for s in statements if s.startswith("INSERT"))
+
+
+async def test_upsert_nothing_to_update(session: AsyncSession, repo: TodoItemRepository):
+    item = TodoItem(title="Test upsert", description="test upsert desc", is_completed=False)
+    session.add(item)
+    await session.commit()
+
+    upserted = await repo.upsert(
+        TodoItem(id=item.id, title="Test upsert updated", description="x", is_completed=True),
+        update_columns=[],
+    )
+    assert upserted.id == item.id
+    assert upserted.title == "Test upsert"
+
+
+async def test_upsert_many_keeps_input_order(session: AsyncSession, repo: TodoItemRepository):
+    items = [
+        TodoItem(title=f"Existing {i}", description="test upsert desc", is_completed=False)
+        for i in range(2)
+    ]
+    session.add_all(items)
+    await session.commit()
+
+    # the rows with and without an id are upserted by separate statements
+    upserted = await repo.upsert_many(
+        [
+            TodoItem(id=items[0].id, title="Updated 0", description="d", is_completed=True),
+            TodoItem(title="New", description="d", is_completed=False),
+            TodoItem(id=items[1].id, title="Updated 1", description="d", is_completed=True),
+        ]
+    )
+
+    assert [u.title for u in upserted] == ["Updated 0", "New", "Updated 1"]
+
+
+async def test_upsert_many_duplicate_conflict_target(
+    session: AsyncSession, repo: TodoItemRepository
+):
+    item = TodoItem(title="Existing", description="test upsert desc", is_completed=False)
+    session.add(item)
+    await session.commit()
+
+    upserted = await repo.upsert_many(
+        [
+            TodoItem(id=item.id, title="First", description="d", is_completed=False),
+            TodoItem(title="New", description="d", is_completed=False),
+            TodoItem(id=item.id, title="Last", description="d", is_completed=True),
+        ]
+    )
+
+    assert [u.title for u in upserted] == ["Last", "New"]
+    assert upserted[0].id == item.id
+    assert upserted[0].is_completed is True
+
+
+async def test_upsert_update_columns(session: AsyncSession, repo: TodoItemRepository):
+    item = TodoItem(title="Test upsert", description="test upsert desc", is_completed=False)
+    session.add(item)
+    await session.commit()
+
+    upserted = await repo.upsert(
+        TodoItem(id=item.id, title="Test upsert updated", description="x", is_completed=True),
+        update_columns=["title"],
+    )
+    assert upserted.title == "Test upsert updated"
+    assert upserted.description == "test upsert desc"
+    assert upserted.is_completed is False
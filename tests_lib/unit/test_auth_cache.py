@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from chronal_api.lib.auth import cache as auth_cache
+
+
+def test_ttl_cache_get_set():
+    cache = auth_cache.TTLCache[str, int](10, 60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats() == auth_cache.CacheStats(
+        size=1, hits=1, misses=1, evictions=0, expirations=0
+    )
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = auth_cache.TTLCache[str, int](2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+@mock.patch("chronal_api.lib.auth.cache.time.monotonic")
+def test_ttl_cache_ttl(mock_monotonic: mock.MagicMock):
+    cache = auth_cache.TTLCache[str, int](10, 60)
+    mock_monotonic.return_value = 100.0
+    cache.set("a", 1)
+
+    mock_monotonic.return_value = 159.0
+    assert cache.get("a") == 1
+
+    mock_monotonic.return_value = 160.0
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_ttl_cache_expires_at():
+    cache = auth_cache.TTLCache[str, int](10, 60)
+    cache.set("a", 1, expires_at=datetime.now(tz=timezone.utc) - timedelta(seconds=1))
+    cache.set("b", 2, expires_at=datetime.now(tz=timezone.utc) + timedelta(seconds=30))
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_ttl_cache_invalidate():
+    cache = auth_cache.TTLCache[str, int](10, 60)
+    cache.set("a", 1)
+
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_disabled():
+    cache = auth_cache.TTLCache[str, int](0, 60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_invalidate_where():
+    cache = auth_cache.TTLCache[str, int](10, 60)
+    for key, value in (("a", 1), ("b", 2), ("c", 1)):
+        cache.set(key, value)
+
+    assert cache.invalidate_where(lambda value: value == 1) == 2
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") is None
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from chronal_api.lib.auth import exceptions as auth_exceptions
+from chronal_api.lib.auth import hashing
+from chronal_api.settings import PasswordHasherSettings
+
+
+@pytest.fixture
+def password_hasher() -> Iterator[hashing.PasswordHasher]:
+    password_hasher = hashing.PasswordHasher(
+        PasswordHasherSettings(workers=2, max_pending=1, queue_timeout=0.05)
+    )
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+async def test_hash_and_verify_password(password_hasher: hashing.PasswordHasher):
+    hashed_password = await password_hasher.hash_password("passw0rd")
+
+    assert await password_hasher.verify_password("passw0rd", hashed_password) is True
+    assert await password_hasher.verify_password("wrong", hashed_password) is False
+
+
+async def test_runs_in_executor_thread(password_hasher: hashing.PasswordHasher):
+    thread = await password_hasher.run(threading.current_thread)
+
+    assert thread is not threading.current_thread()
+    assert isinstance(password_hasher.executor, ThreadPoolExecutor)
+
+
+async def test_raises_busy_when_queue_is_full(password_hasher: hashing.PasswordHasher):
+    release = threading.Event()
+    blocked = asyncio.create_task(password_hasher.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(auth_exceptions.PasswordHasherBusy):
+        await password_hasher.hash_password("passw0rd")
+
+    release.set()
+    assert await blocked is True
+
+
+def test_process_executor():
+    password_hasher = hashing.PasswordHasher(PasswordHasherSettings(executor="process"))
+
+    assert isinstance(password_hasher.executor, ProcessPoolExecutor)
+    password_hasher.shutdown()
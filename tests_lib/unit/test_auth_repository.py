@@ -4,6 +4,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from chronal_api.lib.auth import repository as auth_repository
+from chronal_api.lib.auth import security
 
 
 @pytest.fixture
@@ -22,5 +23,25 @@ async def test_create_token(
 ):
     user = mock.Mock()
     await access_token_repo.create_token(user)
-    mock_access_token.assert_called_once_with(user=user)
+    mock_access_token.assert_called_once_with(user_id=user.id)
     mock_create.assert_called_once()
+
+
+@mock.patch("chronal_api.lib.repository.sqlalchemy.SQLAlchemyRepository.get_one_or_none")
+async def test_get_one_or_none_hashes_token(
+    mock_get_one_or_none: mock.AsyncMock,
+    access_token_repo: auth_repository.AccessTokenRepository,
+):
+    await access_token_repo.get_one_or_none("token")
+
+    mock_get_one_or_none.assert_called_once_with(security.hash_token("token"))
+
+
+async def test_access_token_filter_hashes_token(
+    access_token_repo: auth_repository.AccessTokenRepository,
+):
+    statement = await access_token_repo._where_from_kwargs(
+        access_token_repo.statement, access_token="token"
+    )
+
+    assert statement.compile().params == {"token_hash_1": security.hash_token("token")}
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from uuid import uuid4
+
+from chronal_api.lib.auth import revocation, security
+
+
+def signed_token_hash(expiration_date: datetime) -> bytes:
+    return security.hash_token(security.generate_signed_token(uuid4(), expiration_date))
+
+
+async def test_reload_is_incremental():
+    now = datetime.now(tz=timezone.utc)
+    expiration_date = now + timedelta(days=1)
+    token_hash_1 = signed_token_hash(expiration_date)
+    token_hash_2 = signed_token_hash(expiration_date)
+    repository = mock.AsyncMock()
+    revoked_tokens = revocation.RevocationSet(reload_interval=5, margin=55)
+
+    repository.list_revoked.return_value = [(token_hash_1, expiration_date, now)]
+    assert revoked_tokens.needs_reload()
+    await revoked_tokens.reload(repository)
+
+    repository.list_revoked.return_value = [(token_hash_2, expiration_date, now + timedelta(1))]
+    await revoked_tokens.reload(repository)
+
+    assert repository.list_revoked.call_args_list == [
+        mock.call(since=None),
+        mock.call(since=now - timedelta(seconds=60)),
+    ]
+    assert token_hash_1 in revoked_tokens
+    assert token_hash_2 in revoked_tokens
+    assert not revoked_tokens.needs_reload()
+
+
+async def test_reload_drops_expired():
+    revoked_tokens = revocation.RevocationSet(reload_interval=60)
+    revoked_tokens.add(b"expired", datetime.now(tz=timezone.utc) - timedelta(seconds=1))
+    revoked_tokens.add(b"active", datetime.now(tz=timezone.utc) + timedelta(days=1))
+    repository = mock.AsyncMock()
+    repository.list_revoked.return_value = []
+
+    await revoked_tokens.reload(repository)
+
+    assert b"expired" not in revoked_tokens
+    assert b"active" in revoked_tokens
+    assert len(revoked_tokens) == 1
+
+
+async def test_reload_revocation_committed_out_of_order():
+    now = datetime.now(tz=timezone.utc)
+    expiration_date = now + timedelta(days=1)
+    late_token_hash = signed_token_hash(expiration_date)
+    rows = [(signed_token_hash(expiration_date), expiration_date, now + timedelta(seconds=2))]
+    repository = mock.AsyncMock()
+    repository.list_revoked.side_effect = lambda since: [
+        row for row in rows if since is None or row[2] >= since
+    ]
+    revoked_tokens = revocation.RevocationSet(reload_interval=5, margin=60)
+    await revoked_tokens.reload(repository)
+
+    # timestamped before the row already read, committed after that reload
+    rows.append((late_token_hash, expiration_date, now))
+    await revoked_tokens.reload(repository)
+
+    assert late_token_hash in revoked_tokens
+
+
+async def test_reload_full_every_full_reload_interval():
+    now = datetime.now(tz=timezone.utc)
+    repository = mock.AsyncMock()
+    repository.list_revoked.return_value = [(b"token", now + timedelta(days=1), now)]
+    revoked_tokens = revocation.RevocationSet(reload_interval=5, full_reload_interval=600)
+
+    with mock.patch.object(revocation.time, "monotonic", side_effect=[0.0, 10.0, 610.0]):
+        for _ in range(3):
+            await revoked_tokens.reload(repository)
+
+    assert [call.kwargs["since"] is None for call in repository.list_revoked.call_args_list] == [
+        True,
+        False,
+        True,
+    ]
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from chronal_api.lib.auth import security
+from chronal_api.settings import ChronalSettings
+
+
+def test_signed_token():
+    user_id = uuid4()
+    expiration_date = datetime(2077, 8, 20, 12, 30, tzinfo=timezone.utc)
+
+    token = security.generate_signed_token(user_id, expiration_date)
+    signed_token = security.decode_signed_token(token)
+
+    assert security.is_signed_token(token)
+    assert signed_token is not None
+    assert signed_token.token_id == token.split(".")[1]
+    assert signed_token.user_id == user_id
+    assert signed_token.expiration_date == expiration_date
+
+
+def test_signed_token_tampered():
+    token = security.generate_signed_token(uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc))
+    version, token_id, _, timestamp, signature = token.split(".")
+
+    forged = ".".join((version, token_id, uuid4().hex, timestamp, signature))
+
+    assert security.decode_signed_token(forged) is None
+
+
+def test_signed_token_malformed():
+    assert security.decode_signed_token("v1.not.a.token") is None
+    assert security.decode_signed_token(security.generate_token()) is None
+    assert security.is_signed_token(security.generate_token()) is False
+
+
+def test_signed_token_non_ascii_signature():
+    assert security.decode_signed_token("v1.a.b.c.\xe9") is None
+
+
+def test_signed_token_without_secret_key(monkeypatch: pytest.MonkeyPatch):
+    token = security.generate_signed_token(uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc))
+    monkeypatch.setattr(security.settings, "TOKEN_SECRET_KEY", None)
+
+    assert security.decode_signed_token(token) is None
+    with pytest.raises(RuntimeError):
+        security.generate_signed_token(uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc))
+
+
+def test_signed_format_requires_secret_key(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("CHRONAL_TOKEN_SECRET_KEY", raising=False)
+
+    with pytest.raises(ValidationError, match="TOKEN_SECRET_KEY"):
+        ChronalSettings(TOKEN_FORMAT="signed")
+    assert ChronalSettings(TOKEN_FORMAT="signed", TOKEN_SECRET_KEY="secret").TOKEN_SECRET_KEY
@@ -1,16 +1,26 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest import mock
+from uuid import uuid4
 
 import pytest
 
+from chronal_api.lib.auth import cache as auth_cache
 from chronal_api.lib.auth import exceptions as auth_service_exceptions
-from chronal_api.lib.auth import models as auth_models
+from chronal_api.lib.auth import principal as auth_principal
+from chronal_api.lib.auth import revocation as auth_revocation
+from chronal_api.lib.auth import security as auth_security
 from chronal_api.lib.auth import service as auth_service_
+from chronal_api.lib.auth import sliding as auth_sliding
 
 
 @pytest.fixture
 def auth_service() -> auth_service_.AuthService:
-    return auth_service_.AuthService(mock.AsyncMock())
+    return auth_service_.AuthService(
+        mock.AsyncMock(),
+        auth_cache.TTLCache(10, 60),
+        auth_revocation.RevocationSet(60),
+        auth_sliding.ExpiryExtensions(duration=3600, threshold=600, min_interval=60, maxsize=10),
+    )
 
 
 def test_auth_service_init():
@@ -45,6 +55,49 @@ async def test_delete_token_raises_invalid_token(auth_service: auth_service_.Aut
     auth_service.repository.delete.assert_not_called()
 
 
+async def test_delete_user_tokens(auth_service: auth_service_.AuthService):
+    user_id = uuid4()
+    expiration_date = datetime(2077, 8, 20, tzinfo=timezone.utc)
+    auth_service.token_cache.set(
+        "token", auth_principal.Principal(user_id, "a@a.com", expiration_date)
+    )
+    auth_service.token_cache.set(
+        "other", auth_principal.Principal(uuid4(), "b@b.com", expiration_date)
+    )
+    auth_service.repository.revoke_user_tokens.return_value = [
+        (b"token hash", expiration_date),
+        (b"other hash", expiration_date),
+    ]
+
+    assert await auth_service.delete_user_tokens(user_id) == 2
+
+    auth_service.repository.revoke_user_tokens.assert_called_once_with(user_id, mock.ANY, None)
+    assert auth_service.token_cache.get("token") is None
+    assert auth_service.token_cache.get("other") is not None
+
+
+@pytest.mark.parametrize("token_format", ["opaque", "signed"])
+async def test_delete_user_tokens_revokes_signed_tokens(
+    auth_service: auth_service_.AuthService,
+    monkeypatch: pytest.MonkeyPatch,
+    token_format: str,
+):
+    user_id = uuid4()
+    expiration_date = datetime(2077, 8, 20, tzinfo=timezone.utc)
+    token = auth_security.generate_signed_token(user_id, expiration_date)
+    # issued while signed, logged out everywhere after a switch back to opaque
+    monkeypatch.setattr(auth_service_.settings, "TOKEN_FORMAT", token_format)
+    auth_service.repository.revoke_user_tokens.return_value = [
+        (auth_security.hash_token(token), expiration_date)
+    ]
+    auth_service.repository.list_revoked.return_value = []
+
+    assert await auth_service.delete_user_tokens(user_id) == 1
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.validate_signed_access_token(token)
+
+
 @mock.patch("chronal_api.lib.auth.security.verify_password")
 async def test_authenticate(
     mock_verify_password: mock.MagicMock, auth_service: auth_service_.AuthService
@@ -69,29 +122,199 @@ async def test_authenticate_raises_wrong_password(
         await auth_service.authenticate(user, "password")
 
 
-async def test_validate_access_token(auth_service: auth_service_.AuthService):
+async def test_get_principal_opaque(auth_service: auth_service_.AuthService):
+    principal = auth_principal.Principal(
+        uuid4(), "user@example.com", datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.get_principal.return_value = principal
+
+    assert await auth_service.get_principal("token") == principal
+    auth_service.repository.get_principal.assert_called_once_with("token")
+    auth_service.repository.get_one_or_none.assert_not_called()
+
+
+async def test_get_principal_raises_invalid_access_token(
+    auth_service: auth_service_.AuthService,
+):
+    auth_service.repository.get_principal.return_value = None
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.get_principal("token")
+
+
+async def test_get_principal_raises_expired_access_token(
+    auth_service: auth_service_.AuthService,
+):
+    auth_service.repository.get_principal.return_value = auth_principal.Principal(
+        uuid4(), "user@example.com", datetime(1999, 8, 20, tzinfo=timezone.utc)
+    )
+
+    with pytest.raises(auth_service_exceptions.ExpiredAccessToken):
+        await auth_service.get_principal("token")
+
+
+async def test_get_principal_cached(auth_service: auth_service_.AuthService):
+    principal = auth_principal.Principal(
+        uuid4(), "user@example.com", datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.get_principal.return_value = principal
+
+    await auth_service.get_principal("token")
+    assert await auth_service.get_principal("token") == principal
+
+    auth_service.repository.get_principal.assert_called_once_with("token")
+    assert auth_service.token_cache.stats().hits == 1
+
+
+async def test_delete_token_invalidates_cache(auth_service: auth_service_.AuthService):
+    auth_service.repository.get_principal.return_value = auth_principal.Principal(
+        uuid4(), "user@example.com", datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.exists.return_value = True
+    await auth_service.get_principal("token")
+
+    await auth_service.delete_token("token")
+    auth_service.repository.get_principal.return_value = None
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.get_principal("token")
+
+
+async def test_get_principal_signed(auth_service: auth_service_.AuthService):
+    user_id = uuid4()
     expiration_date = datetime(2077, 8, 20, tzinfo=timezone.utc)
-    access_token = auth_models.AccessToken(access_token="token", expiration_date=expiration_date)
-    auth_service.repository.get_one_or_none.return_value = access_token
+    token = auth_security.generate_signed_token(user_id, expiration_date)
+    auth_service.repository.list_revoked.return_value = []
+    auth_service.repository.get_user_email.return_value = "user@example.com"
+
+    principal = await auth_service.get_principal(token)
 
-    token = await auth_service.validate_access_token("token")
-    assert token
+    auth_service.repository.get_user_email.assert_called_once_with(user_id)
+    auth_service.repository.get_principal.assert_not_called()
+    assert principal == auth_principal.Principal(user_id, "user@example.com", expiration_date)
 
 
-async def test_validate_access_token_raises_invalidate_access_token(
+async def test_get_principal_signed_cached_still_checks_revocation(
     auth_service: auth_service_.AuthService,
 ):
-    auth_service.repository.get_one_or_none.return_value = None
+    token = auth_security.generate_signed_token(
+        uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.list_revoked.return_value = []
+    auth_service.repository.get_user_email.return_value = "user@example.com"
+    await auth_service.get_principal(token)
+
+    auth_service.revoked_tokens.add(
+        auth_security.hash_token(token), datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+
     with pytest.raises(auth_service_exceptions.InvalidAccessToken):
-        await auth_service.validate_access_token("token")
+        await auth_service.get_principal(token)
 
 
-async def test_validate_access_token_raises_expired_access_token(
+async def test_get_principal_sliding_expiry(
+    auth_service: auth_service_.AuthService, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(auth_service_.settings, "TOKEN_SLIDING_EXPIRY", True)
+    expiration_date = datetime.now(tz=timezone.utc) + timedelta(seconds=300)
+    auth_service.repository.get_principal.return_value = auth_principal.Principal(
+        uuid4(), "user@example.com", expiration_date
+    )
+
+    principal = await auth_service.get_principal("token")
+
+    assert principal.expiration_date > expiration_date + timedelta(seconds=3000)
+    assert await auth_service.get_principal("token") == principal
+    auth_service.repository.get_principal.assert_called_once_with("token")
+    assert len(auth_service.expiry_extensions) == 1
+
+
+async def test_get_principal_sliding_expiry_disabled(auth_service: auth_service_.AuthService):
+    expiration_date = datetime.now(tz=timezone.utc) + timedelta(seconds=300)
+    auth_service.repository.get_principal.return_value = auth_principal.Principal(
+        uuid4(), "user@example.com", expiration_date
+    )
+
+    principal = await auth_service.get_principal("token")
+
+    assert principal.expiration_date == expiration_date
+    assert len(auth_service.expiry_extensions) == 0
+
+
+async def test_get_principal_user(auth_service: auth_service_.AuthService):
+    principal = auth_principal.Principal(
+        uuid4(), "user@example.com", datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+
+    user = await auth_service.get_principal_user(principal)
+
+    auth_service.repository.get_user.assert_called_once_with(principal.id)
+    assert user == auth_service.repository.get_user.return_value
+
+
+async def test_validate_signed_access_token_raises_invalid_access_token(
+    auth_service: auth_service_.AuthService,
+):
+    token = auth_security.generate_signed_token(
+        uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.validate_signed_access_token(token[:-1])
+
+
+async def test_validate_signed_access_token_raises_expired_access_token(
     auth_service: auth_service_.AuthService,
 ):
-    expiration_date = datetime(1999, 8, 20, tzinfo=timezone.utc)
-    access_token = auth_models.AccessToken(access_token="token", expiration_date=expiration_date)
-    auth_service.repository.get_one_or_none.return_value = access_token
+    token = auth_security.generate_signed_token(
+        uuid4(), datetime.now(tz=timezone.utc) - timedelta(seconds=1)
+    )
 
     with pytest.raises(auth_service_exceptions.ExpiredAccessToken):
-        await auth_service.validate_access_token("token")
+        await auth_service.validate_signed_access_token(token)
+
+
+async def test_validate_signed_access_token_revoked(auth_service: auth_service_.AuthService):
+    expiration_date = datetime(2077, 8, 20, tzinfo=timezone.utc)
+    token = auth_security.generate_signed_token(uuid4(), expiration_date)
+    auth_service.repository.list_revoked.return_value = [
+        (auth_security.hash_token(token), expiration_date, datetime.now(tz=timezone.utc))
+    ]
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.validate_signed_access_token(token)
+
+
+async def test_delete_token_signed(auth_service: auth_service_.AuthService):
+    token = auth_security.generate_signed_token(
+        uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.revoke_token.return_value = True
+    auth_service.repository.list_revoked.return_value = []
+
+    await auth_service.delete_token(token)
+
+    auth_service.repository.revoke_token.assert_called_once()
+    auth_service.repository.delete.assert_not_called()
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.validate_signed_access_token(token)
+
+
+async def test_delete_token_signed_raises_invalid_token(auth_service: auth_service_.AuthService):
+    token = auth_security.generate_signed_token(
+        uuid4(), datetime(2077, 8, 20, tzinfo=timezone.utc)
+    )
+    auth_service.repository.revoke_token.return_value = False
+
+    with pytest.raises(auth_service_exceptions.InvalidAccessToken):
+        await auth_service.delete_token(token)
+
+
+async def test_delete_expired_tokens(auth_service: auth_service_.AuthService):
+    auth_service.repository.delete_expired.return_value = 3
+
+    assert await auth_service.delete_expired_tokens(100) == 3
+
+    now, batch_size = auth_service.repository.delete_expired.call_args.args
+    assert now <= datetime.now(tz=timezone.utc)
+    assert batch_size == 100
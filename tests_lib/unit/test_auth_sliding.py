@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from chronal_api.lib.auth import security as auth_security
+from chronal_api.lib.auth import sliding as auth_sliding
+
+
+@pytest.fixture
+def extensions() -> auth_sliding.ExpiryExtensions:
+    return auth_sliding.ExpiryExtensions(duration=3600, threshold=600, min_interval=60, maxsize=10)
+
+
+def test_extend_skips_tokens_above_threshold(extensions: auth_sliding.ExpiryExtensions):
+    expiration_date = datetime.now(tz=timezone.utc) + timedelta(seconds=1200)
+
+    assert extensions.extend("token", expiration_date) is None
+    assert len(extensions) == 0
+
+
+def test_extend_once_per_min_interval(extensions: auth_sliding.ExpiryExtensions):
+    expiration_date = datetime.now(tz=timezone.utc) + timedelta(seconds=300)
+
+    new_expiration_date = extensions.extend("token", expiration_date)
+
+    assert new_expiration_date is not None
+    assert new_expiration_date - datetime.now(tz=timezone.utc) > timedelta(seconds=3500)
+    assert extensions.extend("token", expiration_date) is None
+    assert len(extensions) == 1
+
+
+def test_expiry_extensions_requires_maxsize():
+    with pytest.raises(ValueError):
+        auth_sliding.ExpiryExtensions(duration=3600, threshold=600, min_interval=60, maxsize=0)
+
+
+async def test_flush(extensions: auth_sliding.ExpiryExtensions):
+    expiration_date = datetime.now(tz=timezone.utc) + timedelta(seconds=300)
+    new_expiration_date = extensions.extend("token", expiration_date)
+    extensions.extend("other", expiration_date)
+    repository = mock.AsyncMock()
+
+    assert await extensions.flush(repository) == 2
+    assert await extensions.flush(repository) == 0
+
+    repository.extend_expiration.assert_called_once()
+    (pending,) = repository.extend_expiration.call_args.args
+    assert pending[auth_security.hash_token("token")] == new_expiration_date
+    assert len(extensions) == 0
+
+
+async def test_flush_keeps_pending_on_error(extensions: auth_sliding.ExpiryExtensions):
+    extensions.extend("token", datetime.now(tz=timezone.utc) + timedelta(seconds=300))
+    repository = mock.AsyncMock()
+    repository.extend_expiration.side_effect = RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await extensions.flush(repository)
+
+    assert len(extensions) == 1
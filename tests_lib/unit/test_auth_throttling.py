@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from chronal_api.lib.auth import exceptions as auth_exceptions
+from chronal_api.lib.auth import throttling as auth_throttling
+from chronal_api.settings import LoginThrottleSettings
+
+
+@mock.patch("chronal_api.lib.auth.throttling.time.monotonic")
+def test_token_bucket_burst_and_refill(mock_monotonic: mock.MagicMock):
+    mock_monotonic.return_value = 100.0
+    limiter = auth_throttling.TokenBucketLimiter[str](burst=2, rate=0.5, maxsize=10)
+
+    assert limiter.consume("a") == 0
+    assert limiter.consume("a") == 0
+    assert limiter.consume("a") == pytest.approx(2.0)
+    assert limiter.consume("b") == 0
+
+    mock_monotonic.return_value = 102.0
+    assert limiter.consume("a") == 0
+    assert limiter.consume("a") == pytest.approx(2.0)
+
+
+@mock.patch("chronal_api.lib.auth.throttling.time.monotonic")
+def test_token_bucket_drops_idle_buckets(mock_monotonic: mock.MagicMock):
+    mock_monotonic.return_value = 100.0
+    limiter = auth_throttling.TokenBucketLimiter[str](burst=2, rate=1.0, maxsize=10)
+    limiter.consume("a")
+    mock_monotonic.return_value = 101.0
+    limiter.consume("b")
+
+    mock_monotonic.return_value = 102.5
+    limiter.consume("c")
+
+    assert len(limiter) == 2
+
+
+def test_token_bucket_evicts_least_recently_used():
+    limiter = auth_throttling.TokenBucketLimiter[str](burst=1, rate=0.001, maxsize=2)
+    limiter.consume("a")
+    limiter.consume("b")
+    limiter.consume("a")
+
+    limiter.consume("c")
+
+    assert len(limiter) == 2
+    assert limiter.consume("b") == 0
+    assert limiter.consume("c") > 0
+
+
+def test_login_throttle_by_email():
+    throttle = auth_throttling.LoginThrottle(
+        LoginThrottleSettings(ip_burst=10, email_burst=1, email_rate=0.001)
+    )
+    throttle.check("127.0.0.1", "user@example.com")
+
+    with pytest.raises(auth_exceptions.TooManyLoginAttempts) as exc_info:
+        throttle.check("10.0.0.1", "USER@example.com")
+
+    assert exc_info.value.retry_after > 0
+    throttle.check("127.0.0.1", "other@example.com")
+
+
+def test_login_throttle_by_ip():
+    throttle = auth_throttling.LoginThrottle(
+        LoginThrottleSettings(ip_burst=1, ip_rate=0.001, email_burst=10)
+    )
+    throttle.check("127.0.0.1", "user@example.com")
+
+    with pytest.raises(auth_exceptions.TooManyLoginAttempts):
+        throttle.check("127.0.0.1", "other@example.com")
+
+    throttle.check(None, "other@example.com")
+
+
+def test_login_throttle_disabled():
+    throttle = auth_throttling.LoginThrottle(
+        LoginThrottleSettings(enabled=False, ip_burst=1, email_burst=1)
+    )
+
+    for _ in range(3):
+        throttle.check("127.0.0.1", "user@example.com")
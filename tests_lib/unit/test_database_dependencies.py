@@ -0,0 +1,55 @@
+from unittest import mock
+
+from sqlalchemy import event, text
+from starlette.requests import Request
+
+from chronal_api.lib.database import dependencies as database_dependencies
+from chronal_api.lib.database import engine as database_engine
+
+
+async def _endpoint():
+    ...
+
+
+def test_is_read_only():
+    @database_dependencies.read_only
+    async def read_only_endpoint():
+        ...
+
+    request = Request({"type": "http", "method": "POST", "endpoint": read_only_endpoint})
+
+    assert database_dependencies.is_read_only(request)
+
+
+def test_is_read_only_get_by_default():
+    request = Request({"type": "http", "method": "GET", "endpoint": _endpoint})
+
+    assert database_dependencies.is_read_only(request)
+    assert database_dependencies.is_read_only(Request({"type": "http", "method": "HEAD"}))
+    assert not database_dependencies.is_read_only(Request({"type": "http", "method": "POST"}))
+
+
+def test_is_read_only_read_write():
+    @database_dependencies.read_write
+    async def read_write_endpoint():
+        ...
+
+    request = Request({"type": "http", "method": "GET", "endpoint": read_write_endpoint})
+
+    assert not database_dependencies.is_read_only(request)
+
+
+async def test_db_write_session_connects_on_first_statement():
+    await database_engine.dispose_engines()
+    checkout = mock.Mock()
+    event.listen(database_engine.get_engine().sync_engine, "checkout", checkout)
+
+    sessions = database_dependencies.db_write_session()
+    session = await anext(sessions)
+    checkout.assert_not_called()
+
+    await session.execute(text("SELECT 1"))
+    checkout.assert_called_once()
+
+    await sessions.aclose()
+    await database_engine.dispose_engines()
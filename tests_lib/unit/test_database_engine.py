@@ -0,0 +1,206 @@
+import sqlite3
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from sqlalchemy import AsyncAdaptedQueuePool, NullPool, StaticPool, event
+from sqlalchemy.exc import OperationalError
+
+from chronal_api.lib.database import engine as database_engine
+from chronal_api.settings import DatabaseSettings, Environment
+
+
+@pytest.mark.parametrize(
+    ("host", "pool_class", "expected"),
+    [
+        ("//tmp/chronal.db", None, AsyncAdaptedQueuePool),
+        ("", None, StaticPool),
+        ("//tmp/chronal.db", "null", NullPool),
+        ("//tmp/chronal.db", "static", StaticPool),
+    ],
+)
+def test_create_engine_pool_class(host: str, pool_class: str | None, expected: type):
+    settings = DatabaseSettings(HOST=host, POOL_CLASS=pool_class)
+
+    engine = database_engine.create_engine(settings)
+
+    assert isinstance(engine.pool, expected)
+
+
+def test_create_engine_options():
+    settings = DatabaseSettings(
+        HOST="//tmp/chronal.db",
+        ECHO=True,
+        POOL_SIZE=3,
+        MAX_OVERFLOW=0,
+        POOL_TIMEOUT=2.0,
+        POOL_RECYCLE=60,
+        POOL_PRE_PING=True,
+    )
+
+    engine = database_engine.create_engine(settings)
+
+    assert engine.echo is True
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 0
+    assert engine.pool._timeout == 2.0
+    assert engine.pool._recycle == 60
+    assert engine.pool._pre_ping is True
+
+
+@mock.patch("chronal_api.lib.database.engine.create_async_engine")
+def test_create_engine_asyncpg_statement_cache_size(mock_create_async_engine: mock.MagicMock):
+    settings = DatabaseSettings(DB="postgresql", ASYNC_DRIVER="asyncpg", STATEMENT_CACHE_SIZE=0)
+
+    database_engine.create_engine(settings)
+
+    kwargs = mock_create_async_engine.call_args.kwargs
+    assert kwargs["connect_args"] == {"statement_cache_size": 0}
+    assert kwargs["poolclass"] is AsyncAdaptedQueuePool
+
+
+@mock.patch("chronal_api.lib.database.engine.create_async_engine")
+def test_create_engine_keeps_password(mock_create_async_engine: mock.MagicMock):
+    settings = DatabaseSettings(DB="postgresql", ASYNC_DRIVER="asyncpg")
+
+    database_engine.create_engine(settings)
+
+    (url,) = mock_create_async_engine.call_args.args
+    assert url.password == settings.PASSWORD
+
+
+def test_create_engine_asyncpg_url():
+    pytest.importorskip("asyncpg")
+    settings = DatabaseSettings(DB="postgresql", ASYNC_DRIVER="asyncpg")
+
+    engine = database_engine.create_engine(settings)
+
+    assert engine.url.password == settings.PASSWORD
+    assert engine.url.username == settings.USER
+
+
+def test_with_preset_keeps_explicit_values():
+    settings = DatabaseSettings(POOL_SIZE=7).with_preset(Environment.PRODUCTION)
+
+    assert settings.POOL_SIZE == 7
+    assert settings.POOL_PRE_PING is True
+    assert DatabaseSettings().with_preset(Environment.LOCAL) == DatabaseSettings()
+
+
+async def test_create_engine_sqlite_pragmas(tmp_path: Path):
+    settings = DatabaseSettings(
+        HOST=f"/{tmp_path / 'pragmas.db'}", SQLITE_MMAP_SIZE=None, SQLITE_BUSY_TIMEOUT=1234
+    )
+    engine = database_engine.create_engine(settings)
+
+    async with engine.connect() as conn:
+        pragmas = {
+            name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar_one()
+            for name in ("journal_mode", "synchronous", "mmap_size", "temp_store", "busy_timeout")
+        }
+    await engine.dispose()
+
+    # synchronous NORMAL is 1, temp_store MEMORY is 2
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "mmap_size": 0,
+        "temp_store": 2,
+        "busy_timeout": 1234,
+    }
+
+
+def test_sqlite_pragmas_skips_unset():
+    settings = DatabaseSettings(
+        SQLITE_JOURNAL_MODE=None,
+        SQLITE_SYNCHRONOUS="FULL",
+        SQLITE_MMAP_SIZE=None,
+        SQLITE_CACHE_SIZE=None,
+        SQLITE_TEMP_STORE=None,
+        SQLITE_BUSY_TIMEOUT=None,
+    )
+
+    assert settings.sqlite_pragmas() == {"synchronous": "FULL"}
+
+
+async def test_create_engine_sqlite_readers(tmp_path: Path):
+    settings = DatabaseSettings(HOST=f"/{tmp_path / 'readers.db'}", SQLITE_READERS=3)
+    writer = database_engine.create_engine(settings)
+    reader = database_engine.create_engine(settings, read_only=True)
+
+    assert writer.pool.size() == 1
+    assert reader.pool.size() == 3
+
+    async with writer.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+    async with reader.connect() as conn:
+        await conn.exec_driver_sql("SELECT * FROM t")
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    async with writer.connect() as conn:
+        await conn.begin()
+        # BEGIN IMMEDIATE holds the write lock before anything is written
+        other = sqlite3.connect(tmp_path / "readers.db", timeout=0, isolation_level=None)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute("BEGIN IMMEDIATE")
+        other.close()
+        await conn.rollback()
+
+    await writer.dispose()
+    await reader.dispose()
+
+
+async def test_warm_up(tmp_path: Path):
+    engine = database_engine.create_engine(
+        DatabaseSettings(HOST=f"/{tmp_path / 'warm_up.db'}", POOL_SIZE=3)
+    )
+
+    await database_engine.warm_up(engine, 10)
+
+    assert engine.pool.checkedin() == 3
+    await engine.dispose()
+
+
+async def test_warm_up_null_pool(tmp_path: Path):
+    engine = database_engine.create_engine(
+        DatabaseSettings(HOST=f"/{tmp_path / 'warm_up.db'}", POOL_CLASS="null")
+    )
+
+    connect = mock.Mock()
+    event.listen(engine.sync_engine, "connect", connect)
+
+    await database_engine.warm_up(engine, 3)
+
+    connect.assert_not_called()
+
+
+async def test_get_engine_is_lazy_and_disposable():
+    await database_engine.dispose_engines()
+    assert database_engine.get_engine.cache_info().currsize == 0
+
+    engine = database_engine.get_engine()
+    assert database_engine.get_engine() is engine
+    assert database_engine.get_read_engine() is engine
+    assert database_engine.get_sessionmaker().kw["bind"] is engine
+
+    await database_engine.dispose_engines()
+    assert database_engine.get_engine() is not engine
+    await database_engine.dispose_engines()
+
+
+async def test_get_read_sessionmaker_autocommit():
+    await database_engine.dispose_engines()
+
+    sqlite_bind = database_engine.get_read_sessionmaker().kw["bind"]
+    assert "isolation_level" not in sqlite_bind.get_execution_options()
+
+    await database_engine.dispose_engines()
+    with mock.patch.object(database_engine, "get_read_engine") as mock_get_read_engine:
+        mock_get_read_engine.return_value.dialect.name = "postgresql"
+        database_engine.get_read_sessionmaker()
+
+    mock_get_read_engine.return_value.execution_options.assert_called_once_with(
+        isolation_level="AUTOCOMMIT"
+    )
+    await database_engine.dispose_engines()
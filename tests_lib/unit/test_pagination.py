@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from chronal_api.lib.repository import exceptions as repository_exceptions
+from chronal_api.lib.repository.pagination import decode_cursor, encode_cursor
+
+
+def test_encode_decode_cursor():
+    values = [datetime(2023, 10, 8, 12, 30, tzinfo=timezone.utc), uuid4(), 10, "title"]
+
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not a cursor", encode_cursor([{"unknown": 1}]), "eyJhIjogMX0"],  # {"a": 1}
+)
+def test_decode_cursor_raises_invalid_cursor(cursor: str):
+    with pytest.raises(repository_exceptions.InvalidCursor):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2],
+        [datetime(2023, 10, 8, 12, 30), uuid4()],
+        [datetime(2023, 10, 8, 12, 30, tzinfo=timezone.utc), True],
+        [datetime(2023, 10, 8, 12, 30, tzinfo=timezone.utc)],
+    ],
+)
+def test_decode_cursor_raises_invalid_cursor_wrong_types(values: list):
+    with pytest.raises(repository_exceptions.InvalidCursor):
+        decode_cursor(encode_cursor(values), [datetime, UUID])
+
+
+def test_decode_cursor_unknown_type():
+    values = [datetime(2023, 10, 8, 12, 30, tzinfo=timezone.utc), "anything"]
+
+    assert decode_cursor(encode_cursor(values), [datetime, None]) == values
@@ -79,6 +79,12 @@ async def test_service_get(service: Service):
     service.repository.get.assert_called_once_with(id)
 
 
+async def test_service_get_kwargs(service: Service):
+    await service.get(10, projection=["title"])
+
+    service.repository.get.assert_called_once_with(10, projection=["title"])
+
+
 async def test_service_get_raises_item_not_found(service: Service):
     service.repository.get.side_effect = repository_exceptions.NotFound
 
@@ -127,6 +133,31 @@ async def test_service_list_and_count(service: Service):
     service.repository.list_and_count.assert_called_once_with(**data)
 
 
+async def test_service_paginate(service: Service):
+    data = {"test": 1}
+
+    await service.paginate(10, "cursor", **data)
+
+    service.repository.paginate.assert_called_once_with(10, "cursor", **data)
+
+
+async def test_service_paginate_raises_invalid_cursor(service: Service):
+    service.repository.paginate.side_effect = repository_exceptions.InvalidCursor
+
+    with pytest.raises(service_exceptions.InvalidCursor) as exc:
+        await service.paginate(10, "cursor")
+
+    assert isinstance(exc.value.__cause__, repository_exceptions.InvalidCursor)
+
+
+def test_service_stream_(service: Service):
+    data = {"test": 1}
+
+    assert service.stream_(**data) is service.repository.stream_.return_value
+
+    service.repository.stream_.assert_called_once_with(**data)
+
+
 async def test_service_update(service: Service):
     data = {"test": 1}
 
@@ -151,6 +182,22 @@ async def test_service_update_many(service: Service):
     service.repository.update_many.assert_called_once_with(data)
 
 
+async def test_service_update_many_kwargs(service: Service):
+    data = [{"test_1": 1}, {"test_2": 2}]
+    await service.update_many(data, chunk_size=1)
+
+    service.repository.update_many.assert_called_once_with(data, chunk_size=1)
+
+
+async def test_service_update_many_raises_item_not_found(service: Service):
+    service.repository.update_many.side_effect = repository_exceptions.NotFound
+
+    with pytest.raises(service_exceptions.ItemNotFound) as exc:
+        await service.update_many([{"test_1": 1}])
+
+    assert isinstance(exc.value.__cause__, repository_exceptions.NotFound)
+
+
 async def test_service_upsert(service: Service):
     data = {"test": 1}
     await service.upsert(data)
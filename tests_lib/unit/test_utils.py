@@ -1,8 +1,15 @@
+from unittest import mock
+
 import pytest
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from chronal_api.lib.repository import exceptions as repository_exceptions
-from chronal_api.lib.repository.utils import sql_error_handler
+from chronal_api.lib.repository.utils import (
+    chunked,
+    dialect_insert,
+    max_bind_params,
+    sql_error_handler,
+)
 
 
 async def test_sql_error_handler_raises_conflict_error_on_integrity_error():
@@ -27,3 +34,35 @@ async def test_sql_error_handler_raises_repository_exception_on_integrity_error(
             raise AttributeError()
 
     assert isinstance(exc.value.__cause__, AttributeError)
+
+
+def test_chunked():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_chunked_raises_value_error_on_non_positive_size():
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_dialect_insert():
+    dialect = mock.Mock()
+    dialect.name = "sqlite"
+    assert dialect_insert(dialect) is not None
+
+
+def test_dialect_insert_raises_repository_exception_on_unsupported_dialect():
+    dialect = mock.Mock()
+    dialect.name = "mysql"
+    with pytest.raises(repository_exceptions.RepositoryException):
+        dialect_insert(dialect)
+
+
+def test_max_bind_params():
+    dialect = mock.Mock()
+    dialect.name = "sqlite"
+    assert max_bind_params(dialect) == 32766
+
+    dialect.name = "unknown"
+    assert max_bind_params(dialect) == 999